@@ -164,6 +164,7 @@ class ChangeTrackingMixin:
 
         # Also check trace history for runtime connections
         # Find tests that actually called changed entities in previous runs
+        self.flush_trace_calls()
         for entity in changed_entities:
             entity_name = entity.get('name', '')
             if not entity_name:
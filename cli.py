@@ -435,7 +435,8 @@ def cmd_todo_list(args):
         file_path=getattr(args, 'file', None),
         tags=tags,
         limit=getattr(args, 'limit', 50),
-        include_completed=include_completed
+        include_completed=include_completed,
+        lean=True
     )
 
     if not todo_list:
@@ -648,7 +649,7 @@ def cmd_todo_complete(args):
     # Support both --result and --notes
     notes = getattr(args, 'notes', None) or getattr(args, 'result', None)
 
-    success = store.complete_todo(args.id, result=notes, notes=notes)
+    success, next_item = store.complete_and_fetch_next(args.id, result=notes, notes=notes)
 
     if not success:
         print(f"Could not complete TODO #{args.id} - not found", file=sys.stderr)
@@ -660,7 +661,6 @@ def cmd_todo_complete(args):
         print(f"  Notes: {notes}")
 
     # Show next TODO
-    next_item = store.get_next_todo()
     if next_item:
         title = next_item.get('title') or next_item['prompt'][:50]
         print(f"\nNext up: #{next_item['id']} - {title}")
@@ -17,12 +17,20 @@ The CodeStore class is built from mixins to keep file sizes manageable:
 import ast
 import json
 import logging
+import math
 import re
 import sqlite3
 from collections import deque
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from parsers import ParserRegistry, PythonParser, JavaScriptParser, TypeScriptParser, CppParser, ActionScript3Parser, HTMLParser
 from trace_storage import TraceMixin
 from change_tracking import ChangeTrackingMixin
@@ -33,15 +41,102 @@ from failure_log_storage import FailureLogMixin
 from todo_storage import TodoMixin
 
 
+# Exact types that every encoder renders the same way, purely by value (and
+# that are hashable, so tuples of them can be memoized)
+_SCALAR_TYPES = frozenset({int, float, bool, str, type(None)})
+
+# Widest container _is_small_plain accepts, well inside the 100-item list
+# and 50-key dict truncation limits of _safe_serialize
+_SMALL_PLAIN_WIDTH = 20
+
+
+def _is_small_plain(obj: Any) -> bool:
+    """Check whether obj can skip the truncation walk in _safe_serialize.
+
+    True for scalars, and for lists, tuples and str-keyed dicts of at most
+    _SMALL_PLAIN_WIDTH scalars or such flat containers. That bounds the
+    amount of work a direct encode can do, and nothing in it would be
+    truncated or rewritten by the walk.
+    """
+    t = type(obj)
+    if t in _SCALAR_TYPES:
+        return True
+    if t is dict:
+        if len(obj) > _SMALL_PLAIN_WIDTH or not all(type(k) is str for k in obj):
+            return False
+        values = obj.values()
+    elif t is tuple or t is list:
+        if len(obj) > _SMALL_PLAIN_WIDTH:
+            return False
+        values = obj
+    else:
+        return False
+
+    if _SCALAR_TYPES.issuperset(map(type, values)):
+        return True
+    for v in values:
+        vt = type(v)
+        if vt in _SCALAR_TYPES:
+            continue
+        if vt is dict:
+            if (len(v) > _SMALL_PLAIN_WIDTH
+                    or not all(type(k) is str for k in v)
+                    or not _SCALAR_TYPES.issuperset(map(type, v.values()))):
+                return False
+        elif vt is tuple or vt is list:
+            if len(v) > _SMALL_PLAIN_WIDTH or not _SCALAR_TYPES.issuperset(map(type, v)):
+                return False
+        else:
+            return False
+    return True
+
+
+def _has_nonfinite(obj: Any) -> bool:
+    """Check whether a JSON-ready value holds a NaN or infinite float.
+
+    orjson encodes those as null, where json.dumps writes NaN and Infinity,
+    so values holding them are left to the stdlib encoder.
+    """
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(map(_has_nonfinite, obj.values()))
+    if isinstance(obj, (list, tuple)):
+        return any(map(_has_nonfinite, obj))
+    return False
+
+
+# Largest argument tuple, and longest string in it, that _dumps_scalar_tuple
+# memoizes; bigger ones are encoded uncached so the cache stays small
+_MEMO_MAX_ITEMS = 8
+_MEMO_MAX_STR = 64
+
+
+@lru_cache(maxsize=1024)
+def _dumps_scalar_tuple(values: tuple, types: tuple) -> str:
+    """JSON-encode a tuple of scalars, memoized for repeated argument lists.
+
+    types is part of the cache key only, so equal-comparing values of
+    different types (1, 1.0, True) do not share an entry. Callers only pass
+    tuples within _MEMO_MAX_ITEMS and _MEMO_MAX_STR, and none holding a zero
+    float (0.0 and -0.0 would share an entry).
+    """
+    return json.dumps(values, ensure_ascii=False)
+
+
 class CodeStore(SchemaMixin, ChangeTrackingMixin, TraceMixin, NoteMixin, IngestionMixin, FailureLogMixin, TodoMixin):
     """Graph-based code storage with SQLite backend."""
 
     def __init__(self, db_path: str = ":memory:"):
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
+        # The mixins issue well over the default 128 distinct statements;
+        # a larger cache keeps hot ones (trace inserts, todo queries) prepared
+        self.conn = sqlite3.connect(db_path, cached_statements=256)
         self.conn.row_factory = sqlite3.Row
+        self._configure_connection()
         self._embedding_model = None  # Lazy-loaded sentence-transformers model
         self._vec_available = False
+        self._trace_buffer = []  # Pending trace_calls rows (see TraceMixin)
         self._init_schema()
         self._init_vec_table()
 
@@ -1447,8 +1542,56 @@ class CodeStore(SchemaMixin, ChangeTrackingMixin, TraceMixin, NoteMixin, Ingesti
         if max_size is None:
             max_size = self.MAX_SERIALIZED_SIZE
 
+        if ORJSON_AVAILABLE:
+            # Fast path: most traced values are small plain data that orjson
+            # can encode directly, with the same result as the full pass.
+            # Scalars and flat scalar tuples (typical return values and
+            # argument lists) are recognised inline, without a function call.
+            t = type(obj)
+            if (t in _SCALAR_TYPES
+                    or (t is tuple and len(obj) <= 100
+                        and _SCALAR_TYPES.issuperset(map(type, obj)))
+                    or _is_small_plain(obj)):
+                try:
+                    result = orjson.dumps(obj).decode('utf-8')
+                except TypeError:
+                    result = None  # e.g. ints beyond 64 bits
+                if (result is not None and len(result) <= max_size
+                        and ('null' not in result or not _has_nonfinite(obj))):
+                    return result
+        elif type(obj) is tuple and len(obj) <= 100:
+            # Without orjson, the argument tuples of hot or recursive traced
+            # calls repeat often enough that a memoized encode pays off.
+            # Flat tuples within the list limit encode the same as below;
+            # only short ones are cached, so large strings are not retained.
+            # -0.0 == 0.0 with the same type, so a tuple holding a zero float
+            # could be answered with the other sign's entry; those skip it.
+            types = tuple(map(type, obj))
+            if _SCALAR_TYPES.issuperset(types):
+                if (len(obj) <= _MEMO_MAX_ITEMS
+                        and not any((t is str and len(v) > _MEMO_MAX_STR)
+                                    or (t is float and v == 0.0)
+                                    for v, t in zip(obj, types, strict=True))):
+                    result = _dumps_scalar_tuple(obj, types)
+                else:
+                    result = json.dumps(obj, ensure_ascii=False)
+                if len(result) <= max_size:
+                    return result
+
+        # Containers on the current recursion path, for cycle detection, and
+        # the number of values still to visit. Every value adds at least one
+        # character, so once the budget is spent the result is over max_size
+        # and gets replaced below; stop descending rather than expanding
+        # shared or cyclic structures exponentially.
+        on_path = set()
+        budget = max_size
+
         def make_serializable(o, depth=0):
             """Convert non-serializable objects to serializable representations."""
+            nonlocal budget
+            budget -= 1
+            if budget < 0:
+                return "<...>"
             if depth > 10:
                 return "<max depth exceeded>"
 
@@ -1462,7 +1605,31 @@ class CodeStore(SchemaMixin, ChangeTrackingMixin, TraceMixin, NoteMixin, Ingesti
                     return o.decode('utf-8', errors='replace')
                 except Exception:
                     return f"<bytes len={len(o)}>"
-            elif isinstance(o, (list, tuple)):
+            elif isinstance(o, set):
+                return list(o)[:100]
+            elif callable(o) and not isinstance(o, (list, tuple, dict)):
+                return f"<function {getattr(o, '__name__', 'unknown')}>"
+            elif isinstance(o, (list, tuple, dict)) or hasattr(o, '__dict__'):
+                if id(o) in on_path:
+                    return "<circular ref>"
+                on_path.add(id(o))
+                try:
+                    return make_container_serializable(o, depth)
+                finally:
+                    on_path.discard(id(o))
+            else:
+                # Fallback: try str representation
+                try:
+                    s = str(o)
+                    if len(s) > 200:
+                        return s[:200] + "..."
+                    return s
+                except Exception:
+                    return f"<{type(o).__name__}>"
+
+        def make_container_serializable(o, depth):
+            """Convert a list, tuple, dict or object with attributes."""
+            if isinstance(o, (list, tuple)):
                 if len(o) > 100:
                     return [make_serializable(x, depth + 1) for x in o[:100]] + [f"<...{len(o) - 100} more>"]
                 return [make_serializable(x, depth + 1) for x in o]
@@ -1473,11 +1640,7 @@ class CodeStore(SchemaMixin, ChangeTrackingMixin, TraceMixin, NoteMixin, Ingesti
                     result["<truncated>"] = f"{len(o) - 50} more keys"
                     return result
                 return {str(k): make_serializable(v, depth + 1) for k, v in o.items()}
-            elif isinstance(o, set):
-                return list(o)[:100]
-            elif callable(o):
-                return f"<function {getattr(o, '__name__', 'unknown')}>"
-            elif hasattr(o, '__dict__'):
+            else:
                 # Object with attributes
                 cls_name = type(o).__name__
                 try:
@@ -1486,19 +1649,21 @@ class CodeStore(SchemaMixin, ChangeTrackingMixin, TraceMixin, NoteMixin, Ingesti
                     return {"__class__": cls_name, **attrs}
                 except Exception:
                     return f"<{cls_name} object>"
-            else:
-                # Fallback: try str representation
-                try:
-                    s = str(o)
-                    if len(s) > 200:
-                        return s[:200] + "..."
-                    return s
-                except Exception:
-                    return f"<{type(o).__name__}>"
 
         try:
             serializable = make_serializable(obj)
-            result = json.dumps(serializable, ensure_ascii=False)
+            result = None
+            if ORJSON_AVAILABLE:
+                try:
+                    # The truncation pre-pass above stays in Python; only the final
+                    # encode moves to orjson's C encoder
+                    result = orjson.dumps(serializable).decode('utf-8')
+                except TypeError:
+                    pass  # e.g. ints beyond 64 bits - let stdlib json handle them
+                if result is not None and 'null' in result and _has_nonfinite(serializable):
+                    result = None  # Keep NaN/Infinity rather than orjson's null
+            if result is None:
+                result = json.dumps(serializable, ensure_ascii=False)
             if len(result) > max_size:
                 return json.dumps({"<truncated>": f"Object too large ({len(result)} chars)"})
             return result
@@ -1519,7 +1684,8 @@ class CodeStore(SchemaMixin, ChangeTrackingMixin, TraceMixin, NoteMixin, Ingesti
         return d
 
     def close(self):
-        """Close the database connection."""
+        """Close the database connection, writing any buffered trace calls first."""
+        self.flush_trace_calls()
         self.conn.close()
 
     def __enter__(self):
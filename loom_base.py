@@ -5,6 +5,7 @@ loom_base - Shared utilities for loom tools.
 This module provides common functions used across all tool modules:
 - _log_usage: Instrumentation logging
 - _find_store: Database discovery
+- _get_store: Cached, per-thread store for repeated tool calls
 - _find_entity_by_name: Entity lookup
 - _get_file_location: File path formatting
 - _get_code_preview: Code preview extraction
@@ -13,11 +14,19 @@ This module provides common functions used across all tool modules:
 All loom tool modules should import these from here.
 """
 
+import atexit
+import os
+import queue
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from codestore import CodeStore
+# codestore (and the parsers it pulls in) is imported on first use inside
+# _find_store()/_get_store(), so importing a tool module stays cheap
+if TYPE_CHECKING:
+    from codestore import CodeStore
 
 # Instrumentation toggle - set to False to disable usage logging
 LOOM_INSTRUMENTATION = True
@@ -67,12 +76,59 @@ def clear_active_project() -> None:
         ACTIVE_PROJECT_FILE.unlink()
 
 
+# Usage lines waiting for the background writer, as (log path, line) pairs
+_usage_queue = queue.Queue()
+_usage_writer = None
+_usage_writer_lock = threading.Lock()
+
+# Most queued lines the writer appends per batch
+USAGE_BATCH_SIZE = 50
+
+
+def _write_usage_lines() -> None:
+    """Background thread body: append queued usage lines in batches."""
+    while True:
+        batch = [_usage_queue.get()]
+        while len(batch) < USAGE_BATCH_SIZE:
+            try:
+                batch.append(_usage_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        # One open/append per log file per batch
+        by_path = {}
+        for log_path, line in batch:
+            by_path.setdefault(log_path, []).append(line)
+        for log_path, lines in by_path.items():
+            try:
+                with open(log_path, "a", encoding="utf-8") as f:
+                    f.write("".join(lines))
+            except Exception:
+                pass  # Instrumentation should never break functionality
+
+        for _ in batch:
+            _usage_queue.task_done()
+
+
+def _flush_usage_log() -> None:
+    """Block until every queued usage line has been written."""
+    if _usage_writer is not None:
+        _usage_queue.join()
+
+
+atexit.register(_flush_usage_log)
+
+
 def _log_usage(tool_name: str, query: str, result_summary: str) -> None:
     """
     Log tool usage to .loom/usage.log for instrumentation.
 
-    Fails silently to never break actual functionality.
+    The line is handed to a background writer thread so the calling tool
+    does not wait on file I/O; call _flush_usage_log() before reading the
+    log back. Fails silently to never break actual functionality.
     """
+    global _usage_writer
+
     if not LOOM_INSTRUMENTATION:
         return
 
@@ -101,24 +157,24 @@ def _log_usage(tool_name: str, query: str, result_summary: str) -> None:
 
         log_line = f"{timestamp}|{tool_name}|{query_truncated}|{result_truncated}\n"
 
-        with open(log_path, "a", encoding="utf-8") as f:
-            f.write(log_line)
+        if _usage_writer is None:
+            with _usage_writer_lock:
+                if _usage_writer is None:
+                    _usage_writer = threading.Thread(
+                        target=_write_usage_lines, name="loom-usage-log", daemon=True
+                    )
+                    _usage_writer.start()
+        _usage_queue.put_nowait((log_path, log_line))
     except Exception:
         # Fail silently - instrumentation should never break functionality
         pass
 
 
-def _find_store(project_path: Optional[str] = None) -> Optional[CodeStore]:
+def _find_store_path(project_path: Optional[str] = None) -> Optional[Path]:
     """
-    Find .loom/store.db with the following precedence:
-
-    1. Explicit project_path argument (if provided, becomes active project)
-    2. Active project from config (if set and valid)
-    3. Search upward from cwd (original behavior)
+    Locate .loom/store.db without opening it.
 
-    Args:
-        project_path: Optional path to project directory. If provided,
-                      sets this as the active project for future commands.
+    Uses the same precedence as _find_store().
     """
     # 1. Explicit project path takes precedence
     if project_path:
@@ -126,7 +182,7 @@ def _find_store(project_path: Optional[str] = None) -> Optional[CodeStore]:
         db_path = target / ".loom" / "store.db"
         if db_path.exists():
             set_active_project(target)  # Set as active for future commands
-            return CodeStore(str(db_path))
+            return db_path
         return None
 
     # 2. Check active project from config
@@ -134,19 +190,112 @@ def _find_store(project_path: Optional[str] = None) -> Optional[CodeStore]:
     if active:
         db_path = active / ".loom" / "store.db"
         if db_path.exists():
-            return CodeStore(str(db_path))
+            return db_path
 
     # 3. Fall back to upward search from cwd
-    current = Path.cwd()
-    for directory in [current] + list(current.parents):
-        db_path = directory / ".loom" / "store.db"
-        if db_path.exists():
-            return CodeStore(str(db_path))
+    return _search_store_upward(os.getcwd())
+
+
+# Candidate .loom/store.db paths for each directory the upward search has
+# started from, nearest first
+_upward_store_candidates = {}
+
 
+def _search_store_upward(cwd: str) -> Optional[Path]:
+    """
+    Find the nearest .loom/store.db at or above cwd.
+
+    Every call checks each directory from cwd upward, so a store created
+    nearer to cwd is picked up on the next call. Only the candidate paths
+    are remembered per cwd, sparing the path arithmetic on repeated calls.
+    """
+    candidates = _upward_store_candidates.get(cwd)
+    if candidates is None:
+        current = Path(cwd)
+        candidates = _upward_store_candidates[cwd] = tuple(
+            os.path.join(directory, ".loom", "store.db")
+            for directory in [current] + list(current.parents)
+        )
+
+    for db_path in candidates:
+        if os.path.exists(db_path):
+            return Path(db_path)
     return None
 
 
-def _find_entity_by_name(store: CodeStore, name: str) -> Optional[dict]:
+def _find_store(project_path: Optional[str] = None) -> Optional["CodeStore"]:
+    """
+    Find .loom/store.db with the following precedence:
+
+    1. Explicit project_path argument (if provided, becomes active project)
+    2. Active project from config (if set and valid)
+    3. Search upward from cwd (original behavior)
+
+    Args:
+        project_path: Optional path to project directory. If provided,
+                      sets this as the active project for future commands.
+    """
+    db_path = _find_store_path(project_path)
+    if db_path is None:
+        return None
+    from codestore import CodeStore
+    return CodeStore(str(db_path))
+
+
+# Open stores reused by _get_store(), one {db path: CodeStore} LRU per thread
+# since a sqlite3 connection may only be used by its creating thread. Each
+# worker thread of a tool server thus keeps its own warm connection.
+_store_cache = threading.local()
+
+# Most databases a single thread keeps open at once; switching between more
+# projects than this closes the least recently used store
+STORE_CACHE_SIZE = 4
+
+
+def _get_store(project_path: Optional[str] = None) -> Optional["CodeStore"]:
+    """
+    Like _find_store(), but reuse one open store per database and thread.
+
+    Keeping the connection open preserves SQLite's page cache and skips
+    reopening (and re-checking the schema of) the database on every tool
+    call. Callers must not close the returned store; stores are closed at
+    interpreter exit.
+    """
+    db_path = _find_store_path(project_path)
+    if db_path is None:
+        return None
+
+    stores = getattr(_store_cache, "stores", None)
+    if stores is None:
+        stores = _store_cache.stores = OrderedDict()
+
+    key = str(db_path)
+    store = stores.get(key)
+    if store is None:
+        from codestore import CodeStore
+        store = stores[key] = CodeStore(key)
+        while len(stores) > STORE_CACHE_SIZE:
+            _, evicted = stores.popitem(last=False)
+            evicted.close()
+    else:
+        stores.move_to_end(key)
+        if store.conn.in_transaction:
+            # A previous call failed mid-write; don't keep holding its lock
+            store.conn.rollback()
+    return store
+
+
+@atexit.register
+def _close_cached_stores() -> None:
+    """Close the stores cached by _get_store() on the exiting thread."""
+    for store in getattr(_store_cache, "stores", {}).values():
+        try:
+            store.close()
+        except Exception:
+            pass
+
+
+def _find_entity_by_name(store: "CodeStore", name: str) -> Optional[dict]:
     """
     Find an entity by name, trying various strategies.
 
@@ -23,6 +23,7 @@ from pathlib import Path
 from loom_base import (
     LOOM_INSTRUMENTATION,
     _log_usage,
+    _flush_usage_log,
     _find_store,
     _find_entity_by_name,
     _get_file_location,
@@ -85,9 +86,11 @@ from failure_tools import (
 # Re-export TODO/work item tracking tools
 from todo_tools import (
     add_todo,
+    add_todos,
     add_todo_verbose,
     todos,
     get_todos,
+    list_todos_raw,
     next_todo,
     start_todo,
     complete_todo,
@@ -112,6 +115,8 @@ def usage_report() -> str:
         Formatted usage report or 'No usage logged yet' if no log exists
     """
     try:
+        _flush_usage_log()  # Include calls still queued for the writer
+
         # Find .loom directory by searching upward
         current = Path.cwd()
         log_path = None
@@ -256,6 +261,10 @@ TODO/WORK ITEM TRACKING (Simple API for LLM use):
   Add a new TODO to the queue. Returns the TODO id.
   Example: id = add_todo("Fix parser bug", "Handle escaped quotes in strings", tags=["bug"])
 
+- add_todos(items) -> list[int]:
+  Add several TODOs (dicts of add_todo arguments) in one transaction.
+  Example: ids = add_todos([{"title": "A", "prompt": "..."}, {"title": "B", "prompt": "..."}])
+
 - get_todos(status='pending', limit=10) -> str:
   Get formatted list of TODOs.
   Example: print(get_todos())
@@ -274,6 +283,7 @@ TODO/WORK ITEM TRACKING (Simple API for LLM use):
 
 Additional TODO functions:
 - todos(status=None, entity=None, file=None, limit=20): Full-featured TODO listing
+- list_todos_raw(status='pending', limit=10): TODOs as a list of dicts
 - start_todo(todo_id): Mark a TODO as in-progress
 - combine_todos(keep_id, merge_ids, new_prompt=None): Combine overlapping TODOs
 - update_todo(todo_id, prompt=None, context=None, priority=None, tags=None): Update fields
@@ -332,9 +342,11 @@ __all__ = [
     'recent_failures',
     # TODO/work item tracking tools
     'add_todo',
+    'add_todos',
     'add_todo_verbose',
     'todos',
     'get_todos',
+    'list_todos_raw',
     'next_todo',
     'start_todo',
     'complete_todo',
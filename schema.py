@@ -9,6 +9,7 @@ Provides database initialization and migration logic:
 Extracted from codestore.py to reduce its size.
 """
 
+import json
 import logging
 import sqlite3
 
@@ -17,10 +18,33 @@ class SchemaMixin:
     """Mixin providing database schema initialization and migrations."""
 
     # Current schema version for migrations
-    SCHEMA_VERSION = 8
+    SCHEMA_VERSION = 16
+
+    def _configure_connection(self):
+        """Apply per-connection PRAGMA tuning; call once right after connect.
+
+        WAL lets readers (CLI, MCP tools) run alongside a writer, and with
+        synchronous=NORMAL a commit no longer waits on an fsync. Multi-statement
+        writes such as combine_todos and reorder_todo stay atomic under WAL
+        because they run inside a single transaction. busy_timeout makes a
+        second connection wait for the writer lock rather than fail at once.
+        """
+        self.conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=268435456;
+            PRAGMA cache_size=-65536;
+            PRAGMA busy_timeout=5000;
+        """)
 
     def _init_schema(self):
         """Initialize database schema."""
+        # Fast path: an up-to-date database needs no DDL at all, so opening an
+        # existing store costs a single version lookup
+        if self._get_schema_version() >= self.SCHEMA_VERSION:
+            return
+
         self.conn.executescript("""
             CREATE TABLE IF NOT EXISTS entities (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -89,6 +113,8 @@ class SchemaMixin:
     def _run_migrations(self):
         """Run any pending schema migrations."""
         current_version = self._get_schema_version()
+        if current_version >= self.SCHEMA_VERSION:
+            return
 
         if current_version < 2:
             self._migrate_to_v2()
@@ -118,6 +144,38 @@ class SchemaMixin:
             self._migrate_to_v8()
             self._set_schema_version(8)
 
+        if current_version < 9:
+            self._migrate_to_v9()
+            self._set_schema_version(9)
+
+        if current_version < 10:
+            self._migrate_to_v10()
+            self._set_schema_version(10)
+
+        if current_version < 11:
+            self._migrate_to_v11()
+            self._set_schema_version(11)
+
+        if current_version < 12:
+            self._migrate_to_v12()
+            self._set_schema_version(12)
+
+        if current_version < 13:
+            self._migrate_to_v13()
+            self._set_schema_version(13)
+
+        if current_version < 14:
+            self._migrate_to_v14()
+            self._set_schema_version(14)
+
+        if current_version < 15:
+            self._migrate_to_v15()
+            self._set_schema_version(15)
+
+        if current_version < 16:
+            self._migrate_to_v16()
+            self._set_schema_version(16)
+
     def _migrate_to_v2(self):
         """Migration v2: Add runtime tracing tables."""
         self.conn.executescript("""
@@ -335,6 +393,194 @@ class SchemaMixin:
         """)
         self.conn.commit()
 
+    def _migrate_to_v9(self):
+        """Migration v9: Partial index for purging old completed TODOs."""
+        self.conn.executescript("""
+            -- clear_completed_todos() seeks into completed rows by completion time
+            CREATE INDEX IF NOT EXISTS idx_todos_completed_at
+                ON todos(status, completed_at) WHERE status = 'completed';
+        """)
+        self.conn.commit()
+
+    def _migrate_to_v10(self):
+        """Migration v10: Normalized todo_tags table for indexed tag filtering."""
+        self.conn.executescript("""
+            -- One row per (todo, tag); todos.tags keeps the list for display.
+            -- Rows are written by TodoMixin._sync_todo_tags() since triggers
+            -- cannot split the stored list themselves.
+            CREATE TABLE IF NOT EXISTS todo_tags (
+                todo_id INTEGER NOT NULL,
+                tag TEXT NOT NULL,
+                PRIMARY KEY (todo_id, tag),
+                FOREIGN KEY (todo_id) REFERENCES todos(id) ON DELETE CASCADE
+            ) WITHOUT ROWID;
+
+            CREATE INDEX IF NOT EXISTS idx_todo_tags_tag ON todo_tags(tag);
+
+            -- foreign_keys is off by default, so cascade deletes explicitly
+            CREATE TRIGGER IF NOT EXISTS trg_todos_delete_tags
+            AFTER DELETE ON todos
+            BEGIN
+                DELETE FROM todo_tags WHERE todo_id = OLD.id;
+            END;
+        """)
+
+        # Backfill from the existing CSV column
+        rows = self.conn.execute(
+            "SELECT id, tags FROM todos WHERE tags IS NOT NULL AND tags != ''"
+        ).fetchall()
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO todo_tags (todo_id, tag) VALUES (?, ?)",
+            [(row[0], tag) for row in rows for tag in row[1].split(',') if tag]
+        )
+        self.conn.commit()
+
+    def _migrate_to_v11(self):
+        """Migration v11: Composite indexes matching the TODO queue ordering."""
+        self.conn.executescript("""
+            -- list_todos(status=...) and get_next_todo(critical_first=False)
+            CREATE INDEX IF NOT EXISTS idx_todos_status_pri_pos
+                ON todos(status, priority DESC, position ASC, created_at ASC);
+
+            -- get_next_todo() default: critical items first
+            CREATE INDEX IF NOT EXISTS idx_todos_status_crit_pri_pos
+                ON todos(status, critical DESC, priority DESC, position ASC, created_at ASC);
+
+            -- Give the planner statistics so it picks the new indexes
+            ANALYZE todos;
+        """)
+        self.conn.commit()
+
+    def _migrate_to_v12(self):
+        """Migration v12: FTS5 index over TODO prompt/context for search_todos."""
+        try:
+            self.conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS todos_fts USING fts5(
+                    prompt, context,
+                    content='todos', content_rowid='id',
+                    tokenize='unicode61'
+                );
+
+                CREATE TRIGGER IF NOT EXISTS trg_todos_fts_insert
+                AFTER INSERT ON todos
+                BEGIN
+                    INSERT INTO todos_fts(rowid, prompt, context)
+                    VALUES (NEW.id, NEW.prompt, NEW.context);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS trg_todos_fts_delete
+                AFTER DELETE ON todos
+                BEGIN
+                    INSERT INTO todos_fts(todos_fts, rowid, prompt, context)
+                    VALUES ('delete', OLD.id, OLD.prompt, OLD.context);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS trg_todos_fts_update
+                AFTER UPDATE OF prompt, context ON todos
+                BEGIN
+                    INSERT INTO todos_fts(todos_fts, rowid, prompt, context)
+                    VALUES ('delete', OLD.id, OLD.prompt, OLD.context);
+                    INSERT INTO todos_fts(rowid, prompt, context)
+                    VALUES (NEW.id, NEW.prompt, NEW.context);
+                END;
+
+                -- Index any TODOs that predate the table
+                INSERT INTO todos_fts(todos_fts) VALUES ('rebuild');
+            """)
+        except sqlite3.OperationalError as e:
+            # SQLite built without FTS5; search_todos falls back to LIKE
+            logging.warning(f"FTS5 unavailable, TODO search will use LIKE: {e}")
+        self.conn.commit()
+
+    def _migrate_to_v13(self):
+        """Migration v13: Store todos.tags as a JSON array instead of CSV."""
+        # Split in Python: a tag containing a quote would break a pure-SQL rewrite
+        rows = self.conn.execute(
+            "SELECT id, tags FROM todos WHERE tags IS NOT NULL AND tags != ''"
+        ).fetchall()
+        self.conn.executemany(
+            "UPDATE todos SET tags = ? WHERE id = ?",
+            [(json.dumps(row[1].split(',')), row[0]) for row in rows]
+        )
+        self.conn.commit()
+
+    def _migrate_to_v14(self):
+        """Migration v14: Composite indexes matching the trace query orderings."""
+        self.conn.executescript("""
+            -- get_calls_for_run(): WHERE run_id = ? ORDER BY called_at, depth
+            CREATE INDEX IF NOT EXISTS idx_trace_calls_run_time
+                ON trace_calls(run_id, called_at, depth);
+
+            -- get_recent_calls(): WHERE function_name = ? ORDER BY called_at DESC
+            CREATE INDEX IF NOT EXISTS idx_trace_calls_function_time
+                ON trace_calls(function_name, called_at);
+
+            -- get_failed_calls() across runs: newest failures first
+            CREATE INDEX IF NOT EXISTS idx_trace_calls_failed_time
+                ON trace_calls(called_at) WHERE exception_type IS NOT NULL;
+        """)
+        self.conn.commit()
+
+    def _migrate_to_v15(self):
+        """Migration v15: Per-function call counts kept current by triggers."""
+        self.conn.executescript("""
+            -- get_trace_stats() reads its most-called list from here instead
+            -- of grouping all of trace_calls. Triggers cover every writer,
+            -- including the pytest plugin's direct inserts.
+            CREATE TABLE IF NOT EXISTS trace_function_counts (
+                function_name TEXT PRIMARY KEY,
+                call_count INTEGER NOT NULL
+            ) WITHOUT ROWID;
+
+            CREATE TRIGGER IF NOT EXISTS trg_trace_calls_count_insert
+            AFTER INSERT ON trace_calls
+            BEGIN
+                INSERT INTO trace_function_counts (function_name, call_count)
+                VALUES (NEW.function_name, 1)
+                ON CONFLICT(function_name) DO UPDATE SET call_count = call_count + 1;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_trace_calls_count_delete
+            AFTER DELETE ON trace_calls
+            BEGIN
+                UPDATE trace_function_counts SET call_count = call_count - 1
+                WHERE function_name = OLD.function_name;
+                DELETE FROM trace_function_counts
+                WHERE function_name = OLD.function_name AND call_count <= 0;
+            END;
+
+            -- Count calls recorded before the table existed
+            INSERT OR REPLACE INTO trace_function_counts (function_name, call_count)
+            SELECT function_name, COUNT(*) FROM trace_calls GROUP BY function_name;
+        """)
+        self.conn.commit()
+
+    def _migrate_to_v16(self):
+        """Migration v16: TODO search index without Porter stemming.
+
+        Stemming let search_todos("universal") match "universe", which no
+        substring of the text contains. The triggers from v12 refer to the
+        table by name and keep working against the rebuilt one.
+        """
+        row = self.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'todos_fts'"
+        ).fetchone()
+        if row is None or 'porter' not in row[0]:
+            return  # No FTS5 in this build, or already created unstemmed
+
+        self.conn.executescript("""
+            DROP TABLE todos_fts;
+
+            CREATE VIRTUAL TABLE todos_fts USING fts5(
+                prompt, context,
+                content='todos', content_rowid='id',
+                tokenize='unicode61'
+            );
+
+            INSERT INTO todos_fts(todos_fts) VALUES ('rebuild');
+        """)
+        self.conn.commit()
+
     def _init_vec_table(self):
         """Initialize sqlite-vec virtual table for embeddings if available."""
         try:
@@ -0,0 +1,155 @@
+"""Tests for the shared tool helpers in loom_base."""
+
+import sqlite3
+import threading
+
+import pytest
+
+import loom_base
+import todo_tools
+from codestore import CodeStore
+
+
+@pytest.fixture(autouse=True)
+def isolated(tmp_path, monkeypatch):
+    """Keep config, store cache and cwd away from the real environment."""
+    config_dir = tmp_path / "config"
+    monkeypatch.setattr(loom_base, "LOOM_CONFIG_DIR", config_dir)
+    monkeypatch.setattr(loom_base, "ACTIVE_PROJECT_FILE", config_dir / "active_project")
+    monkeypatch.setattr(loom_base, "_store_cache", threading.local())
+    monkeypatch.chdir(tmp_path)
+    yield
+    loom_base._close_cached_stores()
+
+
+def make_project(root, name):
+    """Create a project directory holding an empty .loom/store.db."""
+    project = root / name
+    (project / ".loom").mkdir(parents=True)
+    CodeStore(str(project / ".loom" / "store.db")).close()
+    return project
+
+
+def is_closed(store):
+    """Check whether a store's connection has been closed."""
+    try:
+        store.conn.execute("SELECT 1")
+    except sqlite3.ProgrammingError:
+        return True
+    return False
+
+
+# =============================================================================
+# Store cache
+# =============================================================================
+
+def test_get_store_reuses_store_for_same_path(tmp_path):
+    project = make_project(tmp_path, "proj")
+
+    store = loom_base._get_store(str(project))
+    assert loom_base._get_store(str(project)) is store
+    # The active project set by the first call resolves to the same store
+    assert loom_base._get_store() is store
+    assert not is_closed(store)
+
+
+def test_get_store_evicts_and_closes_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setattr(loom_base, "STORE_CACHE_SIZE", 2)
+    first, second, third = (make_project(tmp_path, n) for n in ("a", "b", "c"))
+
+    store_a = loom_base._get_store(str(first))
+    store_b = loom_base._get_store(str(second))
+    loom_base._get_store(str(first))  # a is now the most recently used
+    loom_base._get_store(str(third))
+
+    assert is_closed(store_b)
+    assert not is_closed(store_a)
+    assert loom_base._get_store(str(second)) is not store_b
+
+
+def test_close_cached_stores_closes_every_store(tmp_path):
+    stores = [loom_base._get_store(str(make_project(tmp_path, n))) for n in ("a", "b")]
+
+    loom_base._close_cached_stores()
+
+    assert all(is_closed(store) for store in stores)
+
+
+def test_tool_calls_leave_cached_store_open(tmp_path):
+    store = loom_base._get_store(str(make_project(tmp_path, "proj")))
+
+    todo_id = todo_tools.add_todo("Task", "Do the task")
+
+    assert loom_base._get_store() is store
+    assert store.get_todo(todo_id)['title'] == "Task"
+
+
+# =============================================================================
+# Usage log
+# =============================================================================
+
+def read_usage_queries(loom_dir):
+    """Return the query field of each usage.log line, in file order."""
+    lines = (loom_dir / "usage.log").read_text().splitlines()
+    return [line.split("|")[2] for line in lines]
+
+
+def test_usage_log_persisted_in_order_after_flush(tmp_path):
+    (tmp_path / ".loom").mkdir()
+    count = loom_base.USAGE_BATCH_SIZE * 2 + 1  # Spans several writer batches
+
+    for i in range(count):
+        loom_base._log_usage("tool", f"query {i}", "ok")
+    loom_base._flush_usage_log()
+
+    assert read_usage_queries(tmp_path / ".loom") == [f"query {i}" for i in range(count)]
+
+
+def test_usage_log_write_failure_is_swallowed(tmp_path, monkeypatch):
+    # A directory in place of the log file makes the writer's open() fail
+    (tmp_path / ".loom" / "usage.log").mkdir(parents=True)
+    loom_base._log_usage("tool", "lost", "ok")
+    loom_base._flush_usage_log()
+
+    # The writer thread survives and keeps serving later lines
+    other = tmp_path / "other"
+    (other / ".loom").mkdir(parents=True)
+    monkeypatch.chdir(other)
+    loom_base._log_usage("tool", "kept", "ok")
+    loom_base._flush_usage_log()
+
+    assert read_usage_queries(other / ".loom") == ["kept"]
+
+
+def test_usage_log_failure_does_not_reach_tool_call(tmp_path, monkeypatch):
+    class BrokenClock:
+        @staticmethod
+        def now():
+            raise OSError("clock unavailable")
+
+    loom_base._get_store(str(make_project(tmp_path, "proj")))
+    monkeypatch.setattr(loom_base, "datetime", BrokenClock)
+
+    todo_id = todo_tools.add_todo("Task", "Do the task")
+
+    assert loom_base._get_store().get_todo(todo_id)['title'] == "Task"
+
+
+# =============================================================================
+# Upward store search
+# =============================================================================
+
+def test_search_store_upward_prefers_store_created_nearer(tmp_path):
+    outer = make_project(tmp_path, "outer")
+    inner = outer / "pkg"
+    cwd = inner / "src"
+    cwd.mkdir(parents=True)
+
+    assert loom_base._search_store_upward(str(cwd)) == outer / ".loom" / "store.db"
+
+    (inner / ".loom").mkdir()
+    (inner / ".loom" / "store.db").touch()
+    assert loom_base._search_store_upward(str(cwd)) == inner / ".loom" / "store.db"
+
+    (inner / ".loom" / "store.db").unlink()
+    assert loom_base._search_store_upward(str(cwd)) == outer / ".loom" / "store.db"
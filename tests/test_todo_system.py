@@ -14,10 +14,15 @@ allowing LLMs to track tasks, combine overlapping items, and complete them
 as work progresses.
 """
 
+import math
+import re
 import pytest
 from pathlib import Path
 from datetime import datetime, timedelta
 from codestore import CodeStore
+import loom_base
+import todo_storage
+import todo_tools
 
 
 @pytest.fixture
@@ -330,6 +335,20 @@ def test_start_todo_sets_started_at_timestamp(temp_store):
     assert before <= started_at <= after
 
 
+def test_start_next_todo_claims_queue_head(temp_store):
+    """Test that start_next_todo starts and returns the next pending TODO."""
+    first = temp_store.add_todo("First")
+    second = temp_store.add_todo("Second")
+
+    todo = temp_store.start_next_todo()
+    assert todo['id'] == first
+    assert todo['status'] == 'in_progress'
+    assert todo['started_at'] is not None
+
+    assert temp_store.start_next_todo()['id'] == second
+    assert temp_store.start_next_todo() is None
+
+
 def test_complete_todo_in_progress_to_completed(temp_store):
     """Test transitioning a TODO from in_progress to completed."""
     todo_id = temp_store.add_todo("Task to complete")
@@ -404,6 +423,63 @@ def test_complete_todo_with_result_in_metadata(temp_store):
     assert todo['metadata']['success'] is True
 
 
+def test_complete_todo_merges_existing_metadata(temp_store):
+    """Test that completing keeps existing metadata keys."""
+    todo_id = temp_store.add_todo("Task", metadata={"source": "review"})
+
+    temp_store.complete_todo(todo_id, result="Done", success=False)
+
+    metadata = temp_store.get_todo(todo_id)['metadata']
+    assert metadata == {"source": "review", "result": "Done", "success": False}
+
+
+def test_complete_and_fetch_next(temp_store):
+    """Test completing a TODO and getting the next one in one call."""
+    first = temp_store.add_todo("First")
+    second = temp_store.add_todo("Second")
+
+    completed, next_todo = temp_store.complete_and_fetch_next(first, result="Done")
+    assert completed is True
+    assert next_todo['id'] == second
+    assert temp_store.get_todo(first)['status'] == 'completed'
+
+    assert temp_store.complete_and_fetch_next(99999) == (False, None)
+
+
+def test_complete_nonexistent_todo(temp_store):
+    """Test that completing a missing TODO returns False."""
+    assert temp_store.complete_todo(99999) is False
+
+
+def test_corrupt_metadata_reads_as_empty(temp_store):
+    """Test that unparseable stored metadata decodes to an empty dict."""
+    todo_id = temp_store.add_todo("Task")
+    temp_store.conn.execute("UPDATE todos SET metadata = '{not json' WHERE id = ?", (todo_id,))
+    temp_store.conn.commit()
+
+    assert temp_store.get_todo(todo_id)['metadata'] == {}
+    assert temp_store.list_todos()[0]['metadata'] == {}
+
+
+def test_corrupt_tags_read_as_empty(temp_store):
+    """Test that unparseable stored tags decode to an empty list."""
+    todo_id = temp_store.add_todo("Task", tags=["bug"])
+    temp_store.add_todo("Other", tags=["perf"])
+    temp_store.conn.execute("UPDATE todos SET tags = '[' WHERE id = ?", (todo_id,))
+    temp_store.conn.commit()
+
+    assert [t['tags'] for t in temp_store.list_todos()] == [[], ["perf"]]
+
+
+def test_metadata_with_non_finite_floats_round_trips(temp_store):
+    """Test that NaN/Infinity in metadata survive a read back."""
+    todo_id = temp_store.add_todo("Task", metadata={'v': float('nan'), 'w': float('inf')})
+
+    for todo in (temp_store.get_todo(todo_id), temp_store.list_todos()[0]):
+        assert math.isnan(todo['metadata']['v'])
+        assert todo['metadata']['w'] == float('inf')
+
+
 def test_complete_todo_pending_directly(temp_store):
     """Test that a pending TODO can be completed directly."""
     todo_id = temp_store.add_todo("Quick task")
@@ -499,6 +575,19 @@ def test_survivor_has_merged_context(temp_store):
     assert "Another task" in kept['context']
 
 
+def test_merged_context_follows_merge_order(temp_store):
+    """Test that merged context follows merge_ids order and skips missing IDs."""
+    id1 = temp_store.add_todo("Main task")
+    id2 = temp_store.add_todo("First merged")
+    id3 = temp_store.add_todo("Second merged")
+
+    temp_store.combine_todos(id1, [id3, 9999, id2])
+
+    context = temp_store.get_todo(id1)['context']
+    assert context.index("Second merged") < context.index("First merged")
+    assert "#9999" not in context
+
+
 def test_combine_with_new_prompt(temp_store):
     """Test combining TODOs with a new combined prompt."""
     id1 = temp_store.add_todo("Fix bug A")
@@ -685,6 +774,48 @@ def test_tags_filtering_with_multiple_tags(temp_store):
     assert len(todos) == 3
 
 
+def test_tags_filter_matches_whole_tags(temp_store):
+    """Test that tag filtering matches whole tags, not substrings."""
+    temp_store.add_todo("Auth work", tags=["auth"])
+    temp_store.add_todo("Docs work", tags=["authentication-docs"])
+
+    todos = temp_store.list_todos(tags=["auth"])
+    assert [t['prompt'] for t in todos] == ["Auth work"]
+
+
+def test_tags_may_contain_commas(temp_store):
+    """Test that a tag containing a comma round-trips intact."""
+    todo_id = temp_store.add_todo("Task", tags=["a,b", "c"])
+
+    assert temp_store.get_todo(todo_id)['tags'] == ["a,b", "c"]
+    assert [t['id'] for t in temp_store.list_todos(tags=["a,b"])] == [todo_id]
+
+
+def test_tags_filter_follows_updates_and_deletes(temp_store):
+    """Test that the tag index tracks update_todo and delete_todo."""
+    todo_id = temp_store.add_todo("Task", tags=["old"])
+    temp_store.update_todo(todo_id, tags=["new"])
+
+    assert temp_store.list_todos(tags=["old"]) == []
+    assert len(temp_store.list_todos(tags=["new"])) == 1
+
+    temp_store.delete_todo(todo_id)
+    count = temp_store.conn.execute("SELECT COUNT(*) FROM todo_tags").fetchone()[0]
+    assert count == 0
+
+
+def test_lean_listing_skips_long_fields(temp_store):
+    """Test that lean listings omit context, metadata and completion notes."""
+    todo_id = temp_store.add_todo("Task", context="Long background", metadata={"k": 1})
+
+    todo = temp_store.list_todos(lean=True)[0]
+    assert todo['id'] == todo_id
+    assert todo['prompt'] == "Task"
+    assert 'context' not in todo
+    assert 'metadata' not in todo
+    assert 'completion_notes' not in todo
+
+
 def test_very_long_prompt(temp_store):
     """Test handling of very long prompts."""
     long_prompt = "A" * 10000
@@ -774,6 +905,113 @@ def test_search_todos_empty_results(temp_store):
     assert results == []
 
 
+def test_search_todos_matches_word_prefixes(temp_store):
+    """Test that search matches word prefixes and follows prompt edits."""
+    todo_id = temp_store.add_todo("Fix authentication bug")
+    temp_store.add_todo("Unrelated task")
+
+    assert [t['id'] for t in temp_store.search_todos("auth")] == [todo_id]
+
+    temp_store.update_todo(todo_id, prompt="Tune caching layer")
+    assert temp_store.search_todos("authentication") == []
+    assert [t['id'] for t in temp_store.search_todos("caching")] == [todo_id]
+
+
+def test_search_todos_orders_by_priority(temp_store):
+    """Test that higher-priority matches come before lower-priority ones."""
+    low = temp_store.add_todo("Cache invalidation cleanup", priority=0)
+    high = temp_store.add_todo("Cache warmup", priority=5)
+
+    results = temp_store.search_todos("cache")
+    assert [t['id'] for t in results] == [high, low]
+
+
+def test_search_todos_with_punctuation_uses_substring(temp_store):
+    """Test that queries with punctuation keep substring matching."""
+    temp_store.add_todo("Follow up on PR#123 review")
+
+    results = temp_store.search_todos("PR#12")
+    assert len(results) == 1
+
+
+def test_search_todos_matches_inside_words(temp_store):
+    """Test that search keeps substring matching for partial words."""
+    parse_error = temp_store.add_todo("Handle ParseError in loader")
+    debugging = temp_store.add_todo("Improve debugging output")
+
+    assert [t['id'] for t in temp_store.search_todos("Error")] == [parse_error]
+    assert [t['id'] for t in temp_store.search_todos("bug")] == [debugging]
+
+
+def test_search_todos_ranks_word_matches_before_substrings(temp_store):
+    """Test that whole-word matches come before mid-word substring matches."""
+    debugging = temp_store.add_todo("Improve debugging output", priority=5)
+    bug = temp_store.add_todo("Fix bug in parser", priority=0)
+
+    assert [t['id'] for t in temp_store.search_todos("bug")] == [bug, debugging]
+    assert [t['id'] for t in temp_store.search_todos("bug", limit=1)] == [bug]
+
+
+def test_search_todos_does_not_stem(temp_store):
+    """Test that search never returns TODOs that lack the query text."""
+    universe = temp_store.add_todo("The universe")
+    cache = temp_store.add_todo("Cache warmup")
+
+    assert temp_store.search_todos("universal") == []
+    assert temp_store.search_todos("caching") == []
+    assert [t['id'] for t in temp_store.search_todos("univers")] == [universe]
+    assert [t['id'] for t in temp_store.search_todos("cach")] == [cache]
+
+
+def test_migration_rebuilds_stemmed_search_index(tmp_path):
+    """Test that v16 replaces a Porter-stemmed index from older databases."""
+    db_path = str(tmp_path / "old.db")
+    store = CodeStore(db_path)
+    universe = store.add_todo("The universe")
+    store.conn.executescript("""
+        DROP TABLE todos_fts;
+        CREATE VIRTUAL TABLE todos_fts USING fts5(
+            prompt, context, content='todos', content_rowid='id',
+            tokenize='porter unicode61'
+        );
+        INSERT INTO todos_fts(todos_fts) VALUES ('rebuild');
+        DELETE FROM schema_version WHERE version > 15;
+    """)
+    assert [t['id'] for t in store.search_todos("universal")] == [universe]
+    store.close()
+
+    store = CodeStore(db_path)
+    try:
+        sql = store.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'todos_fts'"
+        ).fetchone()[0]
+        assert 'porter' not in sql
+        assert store.search_todos("universal") == []
+        assert [t['id'] for t in store.search_todos("universe")] == [universe]
+        # The v12 triggers keep the rebuilt index current
+        added = store.add_todo("Universe expansion")
+        assert [t['id'] for t in store.search_todos("expansion")] == [added]
+    finally:
+        store.close()
+
+
+def test_search_todos_excludes_completed(temp_store):
+    """Test that completed TODOs are not returned by search."""
+    todo_id = temp_store.add_todo("Write release notes")
+    temp_store.complete_todo(todo_id)
+
+    assert temp_store.search_todos("release") == []
+
+
+def test_search_todos_finds_open_match_among_many_completed(temp_store):
+    """Test that completed matches do not crowd an open one out of the results."""
+    for i in range(100):
+        temp_store.complete_todo(temp_store.add_todo(f"Polish widget {i}"))
+    active = temp_store.add_todo("Ship widget")
+
+    assert [t['id'] for t in temp_store.search_todos("widget", limit=5)] == [active]
+
+
 def test_clear_completed_todos(temp_store):
     """Test clearing old completed TODOs."""
     # Add and complete a TODO
@@ -802,6 +1040,21 @@ def test_clear_completed_todos(temp_store):
     assert temp_store.get_todo(recent_id) is not None
 
 
+def test_clear_completed_todos_in_batches(temp_store, monkeypatch):
+    """Test that clearing spans several delete batches."""
+    monkeypatch.setattr(todo_storage, "CLEAR_BATCH_SIZE", 2)
+
+    old_timestamp = (datetime.utcnow() - timedelta(days=40)).isoformat()
+    ids = temp_store.add_todos_bulk([{"prompt": f"Old {i}"} for i in range(5)])
+    for todo_id in ids:
+        temp_store.complete_todo(todo_id)
+    temp_store.conn.execute("UPDATE todos SET completed_at = ?", (old_timestamp,))
+    temp_store.conn.commit()
+
+    assert temp_store.clear_completed_todos(days_old=30) == 5
+    assert temp_store.get_todos(status='completed') == []
+
+
 def test_list_todos_include_completed(temp_store):
     """Test listing TODOs including completed ones."""
     temp_store.add_todo("Pending task")
@@ -849,6 +1102,22 @@ def test_list_todos_critical_only(temp_store):
     assert critical[0]['prompt'] == "Critical task"
 
 
+def test_list_todos_filters_before_limit(temp_store):
+    """Test that status and critical filters run in SQL, ahead of the LIMIT."""
+    for i in range(5):
+        temp_store.add_todo(f"Normal {i}", priority=10)
+    crit_ids = [temp_store.add_todo(f"Critical {i}", critical=True) for i in range(2)]
+    temp_store.start_todo(crit_ids[1])
+
+    critical = temp_store.list_todos(critical_only=True, limit=2)
+    assert sorted(t['id'] for t in critical) == crit_ids
+
+    pending_critical = temp_store.list_todos(
+        status='pending', critical_only=True, limit=1
+    )
+    assert [t['id'] for t in pending_critical] == [crit_ids[0]]
+
+
 def test_list_todos_by_entity_name(temp_store):
     """Test listing TODOs filtered by entity name."""
     temp_store.add_todo("Fix function", entity_name="my_function")
@@ -964,5 +1233,175 @@ def test_completed_todos_not_in_default_list(temp_store):
     assert todos[0]['prompt'] == "Pending"
 
 
+# =============================================================================
+# 7. Bulk Writes
+# =============================================================================
+
+def test_bulk_writes_commits_once(temp_store):
+    """Test that writes inside bulk_writes are committed together on exit."""
+    with temp_store.bulk_writes():
+        for i in range(5):
+            temp_store.add_todo(f"Task {i}")
+        assert temp_store.conn.in_transaction
+
+    assert not temp_store.conn.in_transaction
+    assert len(temp_store.get_todos()) == 5
+
+
+def test_bulk_writes_rolls_back_on_error(temp_store):
+    """Test that an exception inside bulk_writes discards the batch."""
+    temp_store.add_todo("Existing")
+
+    with pytest.raises(RuntimeError):
+        with temp_store.bulk_writes():
+            temp_store.add_todo("Discarded")
+            with temp_store.bulk_writes():
+                temp_store.add_todo("Also discarded")
+            raise RuntimeError("boom")
+
+    todos = temp_store.get_todos()
+    assert [t['prompt'] for t in todos] == ["Existing"]
+
+
+def test_add_todos_bulk(temp_store):
+    """Test that add_todos_bulk queues items in order after existing TODOs."""
+    first = temp_store.add_todo("Existing")
+
+    ids = temp_store.add_todos_bulk([
+        {"prompt": "Bulk one", "tags": ["seed"]},
+        {"prompt": "Bulk two", "priority": 0, "critical": True},
+    ])
+
+    assert len(ids) == 2
+    todos = temp_store.get_todos()
+    assert [t['id'] for t in todos] == [first] + ids
+    assert [t['position'] for t in todos] == [1, 2, 3]
+    assert [t['id'] for t in temp_store.list_todos(tags=["seed"])] == [ids[0]]
+    assert temp_store.get_todo(ids[1])['critical'] is True
+
+
+def test_add_todos_bulk_empty(temp_store):
+    """Test that an empty bulk add is a no-op."""
+    assert temp_store.add_todos_bulk([]) == []
+
+
+# =============================================================================
+# 8. Query Plans
+# =============================================================================
+
+def test_next_todo_uses_index_without_sort(temp_store):
+    """Test that get_next_todo's query is served by an index, not a temp sort."""
+    plan = temp_store.conn.execute(
+        """
+        EXPLAIN QUERY PLAN
+        SELECT * FROM todos WHERE status = ?
+        ORDER BY critical DESC, priority DESC, position ASC, created_at ASC
+        LIMIT 1
+        """,
+        (temp_store.TODO_STATUS_PENDING,)
+    ).fetchall()
+    details = ' '.join(row[3] for row in plan)
+
+    assert "USING INDEX" in details
+    assert "TEMP B-TREE" not in details
+
+
+def test_todo_stats_reads_only_the_index(temp_store):
+    """Test that the stats aggregation is a covering-index scan."""
+    temp_store.add_todo("Low", priority=1)
+    temp_store.add_todo("High", priority=3)
+    temp_store.complete_todo(temp_store.add_todo("Done"))
+
+    plan = temp_store.conn.execute(
+        "EXPLAIN QUERY PLAN " + todo_storage._TODO_STATS_SQL
+    ).fetchall()
+    details = ' '.join(row[3] for row in plan)
+    assert "COVERING INDEX" in details
+
+    stats = temp_store.get_todo_stats()
+    assert stats['total'] == 3
+    assert stats['pending'] == 2
+    assert stats['completed'] == 1
+    assert stats['by_status']['pending'] == {'count': 2, 'avg_priority': 2.0}
+
+
+def test_clear_completed_todos_uses_partial_index(temp_store):
+    """Test that each purge batch range-seeks the completed_at partial index."""
+    plan = temp_store.conn.execute(
+        "EXPLAIN QUERY PLAN " + todo_storage._CLEAR_COMPLETED_SQL,
+        ('2000-01-01', todo_storage.CLEAR_BATCH_SIZE)
+    ).fetchall()
+    details = ' '.join(row[3] for row in plan)
+
+    assert 'idx_todos_completed_at' in details
+
+
+# =============================================================================
+# 9. Tool Functions
+# =============================================================================
+
+@pytest.fixture
+def tool_store(temp_store, monkeypatch):
+    """Point the todo_tools functions at temp_store, without usage logging."""
+    monkeypatch.setattr(todo_tools, "_get_store", lambda: temp_store)
+    monkeypatch.setattr(loom_base, "LOOM_INSTRUMENTATION", False)
+    return temp_store
+
+
+def test_add_todos_returns_ids_in_item_order(tool_store):
+    """Test that add_todos returns one id per item, in item order."""
+    ids = todo_tools.add_todos([
+        {"title": "First", "prompt": "Do first", "priority": 1},
+        {"title": "Second", "prompt": "Do second", "entity": "parse", "file": "p.py"},
+    ])
+
+    assert [tool_store.get_todo(i)['title'] for i in ids] == ["First", "Second"]
+    second = tool_store.get_todo(ids[1])
+    assert (second['entity_name'], second['file_path']) == ("parse", "p.py")
+
+
+def test_add_todos_parses_tags(tool_store):
+    """Test that tags may be a list or a comma-separated string."""
+    ids = todo_tools.add_todos([
+        {"title": "Listed", "prompt": "p", "tags": ["bug", "parser"]},
+        {"title": "Joined", "prompt": "p", "tags": "bug, perf"},
+        {"title": "Untagged", "prompt": "p"},
+    ])
+
+    assert [tool_store.get_todo(i)['tags'] for i in ids] == [
+        ["bug", "parser"], ["bug", "perf"], [],
+    ]
+
+
+@pytest.mark.parametrize("item, message", [
+    ({"title": "T", "prompt": "p", "entity_name": "x"}, "unknown key(s) entity_name"),
+    ({"prompt": "p"}, "missing required key(s) title"),
+])
+def test_add_todos_rejects_bad_items(tool_store, item, message):
+    """Test that a bad item raises ValueError and adds nothing."""
+    with pytest.raises(ValueError, match=re.escape(f"item 1: {message}")):
+        todo_tools.add_todos([{"title": "Good", "prompt": "p"}, item])
+
+    assert tool_store.get_todos(status=None) == []
+
+
+def test_list_todos_raw_filters_limits_and_returns_dicts(tool_store):
+    """Test that list_todos_raw returns decoded TODO dicts for one status."""
+    ids = [tool_store.add_todo(f"Task {i}", tags=["x"]) for i in range(4)]
+    tool_store.complete_todo(ids[0])
+    tool_store.start_todo(ids[1])
+
+    pending = todo_tools.list_todos_raw()
+    assert [t['id'] for t in pending] == ids[2:]
+    assert {'id', 'title', 'prompt', 'status', 'priority', 'tags'} <= pending[0].keys()
+    assert pending[0]['prompt'] == "Task 2"
+    assert pending[0]['tags'] == ["x"]
+
+    assert [t['id'] for t in todo_tools.list_todos_raw(limit=1)] == [ids[2]]
+    assert [t['id'] for t in todo_tools.list_todos_raw('in_progress')] == [ids[1]]
+    completed = todo_tools.list_todos_raw('completed')
+    assert [(t['id'], t['status']) for t in completed] == [(ids[0], 'completed')]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
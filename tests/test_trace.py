@@ -1,5 +1,7 @@
 """Tests for runtime tracing storage layer."""
 
+import json
+import math
 import pytest
 import tempfile
 import os
@@ -87,6 +89,14 @@ class TestRecordCall:
         assert calls[0]['kwargs'] == {'precision': 2}
         assert calls[0]['return_value'] == 3
 
+    def test_record_call_with_empty_args(self, cs):
+        run_id = cs.start_trace_run()
+        cs.record_call(run_id=run_id, function_name='f', args=(), kwargs={})
+
+        call = cs.get_calls_for_run(run_id)[0]
+        assert call['args_json'] == '[]'
+        assert call['kwargs_json'] == '{}'
+
     def test_record_call_with_exception(self, cs):
         run_id = cs.start_trace_run()
         cs.record_call(
@@ -135,6 +145,38 @@ class TestRecordCall:
         assert child_call['parent_call_id'] == parent_id
         assert child_call['depth'] == 1
 
+    def test_record_call_is_buffered_until_flush(self, cs):
+        run_id = cs.start_trace_run()
+        call_id = cs.record_call(run_id=run_id, function_name='buffered.function')
+
+        count = cs.conn.execute("SELECT COUNT(*) FROM trace_calls").fetchone()[0]
+        assert count == 0
+
+        assert cs.flush_trace_calls() == 1
+        row = cs.conn.execute("SELECT call_id FROM trace_calls").fetchone()
+        assert row['call_id'] == call_id
+
+    def test_record_call_flushes_at_batch_size(self, cs, monkeypatch):
+        monkeypatch.setattr(CodeStore, 'TRACE_BATCH_SIZE', 3)
+        run_id = cs.start_trace_run()
+        for i in range(4):
+            cs.record_call(run_id=run_id, function_name=f'batch.function_{i}')
+
+        count = cs.conn.execute("SELECT COUNT(*) FROM trace_calls").fetchone()[0]
+        assert count == 3
+        assert len(cs.get_calls_for_run(run_id)) == 4
+
+    def test_record_call_with_preallocated_id(self, cs):
+        run_id = cs.start_trace_run()
+        call_id = cs.record_call(
+            run_id=run_id,
+            function_name='preallocated.function',
+            call_id='fixed-call-id'
+        )
+
+        assert call_id == 'fixed-call-id'
+        assert cs.get_calls_for_run(run_id)[0]['call_id'] == 'fixed-call-id'
+
 
 class TestSafeSerialization:
     """Tests for safe serialization of complex objects."""
@@ -256,6 +298,77 @@ class TestSafeSerialization:
         # Set is converted to list
         assert set(calls[0]['args'][0]) == {1, 2, 3}
 
+    def test_serialize_small_deep_nesting_capped(self, cs):
+        nested = 1
+        for _ in range(12):
+            nested = [nested]
+
+        result = cs._safe_serialize(nested)
+        assert '<max depth exceeded>' in result
+
+    def test_serialize_scalar_tuples_memoized_by_type(self, cs, monkeypatch):
+        import codestore
+        monkeypatch.setattr(codestore, 'ORJSON_AVAILABLE', False)
+
+        assert cs._safe_serialize((1, 'a')) == '[1, "a"]'
+        assert cs._safe_serialize((True,)) == '[true]'
+        assert cs._safe_serialize((1,)) == '[1]'
+        assert cs._safe_serialize((1.0,)) == '[1.0]'
+        assert codestore._dumps_scalar_tuple.cache_info().currsize >= 4
+
+        hits = codestore._dumps_scalar_tuple.cache_info().hits
+        cs._safe_serialize((1, 'a'))
+        assert codestore._dumps_scalar_tuple.cache_info().hits == hits + 1
+
+    def test_serialize_large_scalar_tuples_not_memoized(self, cs, monkeypatch):
+        import codestore
+        monkeypatch.setattr(codestore, 'ORJSON_AVAILABLE', False)
+        misses = codestore._dumps_scalar_tuple.cache_info().misses
+
+        long_str = 'x' * (codestore._MEMO_MAX_STR + 1)
+        assert cs._safe_serialize((long_str,)) == json.dumps([long_str])
+        wide = tuple(range(codestore._MEMO_MAX_ITEMS + 1))
+        assert cs._safe_serialize(wide) == json.dumps(list(wide))
+        assert codestore._dumps_scalar_tuple.cache_info().misses == misses
+
+    def test_serialize_signed_zero_tuples_keep_sign(self, cs, monkeypatch):
+        import codestore
+        monkeypatch.setattr(codestore, 'ORJSON_AVAILABLE', False)
+
+        assert cs._safe_serialize((0.0, 1)) == '[0.0, 1]'
+        assert cs._safe_serialize((-0.0, 1)) == '[-0.0, 1]'
+        assert cs._safe_serialize((0.0, 1)) == '[0.0, 1]'
+
+    def test_serialize_circular_reference_marked(self, cs):
+        circular = {'a': 1}
+        circular['self'] = circular
+
+        assert json.loads(cs._safe_serialize(circular)) == {'a': 1, 'self': '<circular ref>'}
+
+    def test_serialize_shared_references_bounded(self, cs):
+        # 50 ** 11 leaves if expanded naively
+        shared = [1] * 50
+        for _ in range(10):
+            shared = [shared] * 50
+
+        start = time.perf_counter()
+        result = json.loads(cs._safe_serialize(shared))
+        assert time.perf_counter() - start < 5
+        assert '<truncated>' in result
+
+    def test_serialize_non_string_keys(self, cs):
+        assert json.loads(cs._safe_serialize({1: 'a', None: 'b'})) == {'1': 'a', 'None': 'b'}
+
+    def test_serialize_non_finite_floats_kept(self, cs):
+        # Non-str keys route this through the full pass and its final encode
+        result = cs._safe_serialize({1: float('nan'), 2: float('-inf'), 3: None})
+        assert result == '{"1": NaN, "2": -Infinity, "3": null}'
+
+    def test_serialize_small_non_finite_floats_kept(self, cs):
+        assert cs._safe_serialize(float('inf')) == 'Infinity'
+        assert cs._safe_serialize((1.5, float('nan'), None)) == '[1.5, NaN, null]'
+        assert cs._safe_serialize({'x': [float('-inf')]}) == '{"x": [-Infinity]}'
+
 
 class TestGetCallsForRun:
     """Tests for retrieving calls by run."""
@@ -291,10 +404,42 @@ class TestGetCallsForRun:
                        args=(1, 2), kwargs={'a': 1}, return_value=3)
 
         calls = cs.get_calls_for_run(run_id, include_args=False)
+        assert 'args_json' not in calls[0]
+        assert calls[0]['function_name'] == 'test'
         assert 'args' not in calls[0]
         assert 'kwargs' not in calls[0]
         assert 'return_value' not in calls[0]
 
+    def test_get_calls_malformed_payload_is_none(self, cs):
+        run_id = cs.start_trace_run()
+        cs.record_call(run_id=run_id, function_name='test', args=(1,))
+        cs.flush_trace_calls()
+        cs.conn.execute("UPDATE trace_calls SET args_json = '[1,'")
+
+        call = cs.get_calls_for_run(run_id)[0]
+        assert call['args'] is None
+
+    def test_get_calls_non_finite_floats_round_trip(self, cs):
+        run_id = cs.start_trace_run()
+        cs.record_call(run_id=run_id, function_name='test',
+                       args=(float('nan'), 1), return_value=float('inf'))
+        cs.flush_trace_calls()
+
+        call = cs.get_calls_for_run(run_id)[0]
+        assert math.isnan(call['args'][0]) and call['args'][1] == 1
+        assert call['return_value'] == float('inf')
+
+    def test_iter_calls_streams_in_chunks(self, cs, monkeypatch):
+        monkeypatch.setattr(CodeStore, 'TRACE_FETCH_SIZE', 2)
+        run_id = cs.start_trace_run()
+        for i in range(5):
+            cs.record_call(run_id=run_id, function_name=f'f{i}', args=(i,),
+                           called_at=f'2024-01-01T10:00:0{i}')
+
+        calls = cs.iter_calls_for_run(run_id)
+        assert next(calls)['args'] == [0]
+        assert [c['function_name'] for c in calls] == ['f1', 'f2', 'f3', 'f4']
+
 
 class TestGetRecentCalls:
     """Tests for retrieving recent calls by function name."""
@@ -428,6 +573,22 @@ class TestTraceStats:
         assert stats['top_functions'][0]['function'] == 'common.func'
         assert stats['top_functions'][0]['count'] == 3
 
+    def test_function_counts_follow_inserts_and_deletes(self, cs):
+        run_id = cs.start_trace_run()
+        for _ in range(3):
+            cs.record_call(run_id=run_id, function_name='hot.func')
+        cs.record_call(run_id=run_id, function_name='cold.func')
+        cs.flush_trace_calls()
+
+        cs.conn.execute("DELETE FROM trace_calls WHERE function_name = 'cold.func'")
+        cs.conn.execute(
+            "DELETE FROM trace_calls WHERE call_id IN "
+            "(SELECT call_id FROM trace_calls WHERE function_name = 'hot.func' LIMIT 1)"
+        )
+
+        stats = cs.get_trace_stats()
+        assert stats['top_functions'] == [{'function': 'hot.func', 'count': 2}]
+
     def test_get_stats_nonexistent_run(self, cs):
         stats = cs.get_trace_stats('nonexistent')
         assert stats == {}
@@ -459,9 +620,48 @@ class TestSchemaMigration:
         assert 'idx_trace_calls_run' in index_names
         assert 'idx_trace_calls_function' in index_names
 
+    def test_todo_completed_index_created(self, cs):
+        indices = cs.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='index'"
+        ).fetchall()
+        index_names = [i[0] for i in indices]
+
+        assert 'idx_todos_completed_at' in index_names
+
+    def test_trace_queries_use_composite_indexes(self, cs):
+        for sql, params, index in [
+            ("SELECT * FROM trace_calls WHERE run_id = ? ORDER BY called_at, depth",
+             ('r',), 'idx_trace_calls_run_time'),
+            ("SELECT * FROM trace_calls WHERE function_name = ? "
+             "ORDER BY called_at DESC LIMIT ?",
+             ('f', 10), 'idx_trace_calls_function_time'),
+        ]:
+            plan = cs.conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+            details = ' '.join(row[-1] for row in plan)
+
+            assert index in details
+            assert 'TEMP B-TREE' not in details
+
+    def test_connection_uses_wal(self, cs):
+        assert cs.conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        assert cs.conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert cs.conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
     def test_schema_version_tracked(self, cs):
         version = cs._get_schema_version()
-        assert version == 3  # Updated to v3 with notes/knowledge tables
+        assert version == cs.SCHEMA_VERSION
+
+    def test_current_database_skips_migrations(self, cs, monkeypatch):
+        """An up-to-date database should not re-run any migration DDL."""
+        def fail_migration(self):
+            pytest.fail("migration re-run on a current database")
+
+        monkeypatch.setattr(CodeStore, '_migrate_to_v2', fail_migration)
+        cs._run_migrations()
+
+        reopened = CodeStore(cs.db_path)
+        assert reopened._get_schema_version() == CodeStore.SCHEMA_VERSION
+        reopened.close()
 
     def test_migration_idempotent(self, cs):
         """Running migrations again should not fail."""
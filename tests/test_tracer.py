@@ -3,6 +3,7 @@
 import pytest
 import tempfile
 import os
+import sqlite3
 import sys
 import time
 import threading
@@ -67,6 +68,40 @@ class TestTraceDecorator:
 
         assert calls[0]['kwargs'] == {'greeting': 'Hi'}
 
+    def test_function_location_recorded(self, db_path):
+        """Verify the source file and definition line are recorded."""
+        @trace
+        def located():
+            return None
+
+        with trace_run(db_path=db_path) as run_id:
+            located()
+
+        store = CodeStore(db_path)
+        calls = store.get_calls_for_run(run_id)
+        store.close()
+
+        assert calls[0]['file_path'].endswith('test_tracer.py')
+        assert calls[0]['line_number'] == get_original(located).__code__.co_firstlineno
+
+    def test_fixed_arity_function_called_by_keyword(self, db_path):
+        """Verify specialized wrappers accept keywords and record values in order."""
+        @trace
+        def subtract(a, b):
+            return a - b
+
+        with trace_run(db_path=db_path) as run_id:
+            result = subtract(b=1, a=3)
+
+        assert result == 2
+
+        store = CodeStore(db_path)
+        calls = store.get_calls_for_run(run_id)
+        store.close()
+
+        assert calls[0]['args'] == [3, 1]
+        assert calls[0]['kwargs'] == {}
+
     def test_no_tracing_without_context(self, db_path):
         """Verify functions work normally without trace_run context."""
         call_count = [0]
@@ -119,6 +154,29 @@ class TestTraceDecorator:
         # (accounting for the single attribute check)
         assert traced_time < untraced_time * 5
 
+    def test_sampled_function_records_every_nth_call(self, db_path):
+        """Verify @trace(sample=N) records one call in N."""
+        @trace(sample=3)
+        def square(x):
+            return x * x
+
+        square(0)  # Calls made outside a run don't advance the stride
+        with trace_run(db_path=db_path) as run_id:
+            results = [square(i) for i in range(7)]
+
+        assert results == [i * i for i in range(7)]
+
+        store = CodeStore(db_path)
+        calls = store.get_calls_for_run(run_id)
+        store.close()
+
+        assert [c['args'] for c in calls] == [[0], [3], [6]]
+
+    def test_sample_must_be_positive(self):
+        """Verify a zero sample rate is rejected."""
+        with pytest.raises(ValueError):
+            trace(sample=0)
+
 
 class TestNestedCalls:
     """Tests for nested/recursive call tracking."""
@@ -443,6 +501,145 @@ class TestTraceRun:
         assert run['ended_at'] is not None
         assert run['started_at'] < run['ended_at']
 
+    def test_run_include_exclude_filters(self, db_path):
+        """Verify include/exclude patterns limit which calls are recorded."""
+        @trace
+        def keep_outer():
+            return skip_middle()
+
+        @trace
+        def skip_middle():
+            return keep_inner()
+
+        @trace
+        def keep_inner():
+            return 1
+
+        @trace
+        def other():
+            return 2
+
+        with trace_run(db_path=db_path, include=["*.keep_*", "*.skip_*"],
+                       exclude="*.skip_middle") as run_id:
+            keep_outer()
+            other()
+
+        store = CodeStore(db_path)
+        calls = store.get_calls_for_run(run_id)
+        store.close()
+
+        names = [c['function_name'].rsplit('.', 1)[-1] for c in calls]
+        assert names == ['keep_outer', 'keep_inner']
+        # The filtered-out middle call is skipped in the call tree
+        assert calls[1]['parent_call_id'] == calls[0]['call_id']
+        assert calls[1]['depth'] == 1
+
+    def test_writer_thread_drained_on_exit(self, db_path):
+        """Verify every queued call is stored and the writer thread has exited."""
+        @trace
+        def square(x):
+            return x * x
+
+        with trace_run(db_path=db_path) as run_id:
+            for i in range(1200):
+                square(i)
+
+        assert not any(t.name.startswith('loom-trace-writer')
+                       for t in threading.enumerate())
+
+        store = CodeStore(db_path)
+        calls = store.get_calls_for_run(run_id)
+        store.close()
+
+        assert len(calls) == 1200
+        assert calls[-1]['return_value'] == 1199 * 1199
+
+    def test_writer_failure_reported_and_queue_drained(self, db_path, monkeypatch):
+        """Verify a failing writer keeps draining and trace_run reports it."""
+        import tracer
+
+        def locked(self, rows):
+            raise sqlite3.OperationalError("database is locked")
+
+        monkeypatch.setattr(CodeStore, 'record_calls', locked)
+        monkeypatch.setattr(tracer, 'WRITER_BATCH_SIZE', 2)
+
+        @trace
+        def square(x):
+            return x * x
+
+        with pytest.raises(RuntimeError, match="database is locked"):
+            with trace_run(db_path=db_path):
+                call_queue = tracer._trace_context.run_state[2]
+                assert [square(i) for i in range(100)][-1] == 99 * 99
+
+        assert call_queue.empty()
+        assert not any(t.name.startswith('loom-trace-writer')
+                       for t in threading.enumerate())
+
+    def test_writer_failure_does_not_mask_body_exception(self, db_path, monkeypatch):
+        """Verify a writer failure during a failing run only warns."""
+        def locked(self, rows):
+            raise sqlite3.OperationalError("database is locked")
+
+        monkeypatch.setattr(CodeStore, 'record_calls', locked)
+
+        @trace
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.warns(RuntimeWarning, match="trace writer failed"):
+            with pytest.raises(ValueError, match="boom"):
+                with trace_run(db_path=db_path):
+                    fail()
+
+    def test_args_captured_before_mutation(self, db_path):
+        """Verify arguments are recorded as they were when the call started."""
+        @trace
+        def append_item(items):
+            items.append('added')
+            return len(items)
+
+        with trace_run(db_path=db_path) as run_id:
+            append_item(['original'])
+
+        store = CodeStore(db_path)
+        calls = store.get_calls_for_run(run_id)
+        store.close()
+
+        assert calls[0]['args'] == [['original']]
+
+    def test_active_run_count_restored(self, db_path):
+        """Verify the inactive fast path is re-enabled after a failed run."""
+        import tracer
+
+        with pytest.raises(ValueError):
+            with trace_run(db_path=db_path):
+                assert tracer._active_runs == 1
+                raise ValueError("test error")
+
+        assert tracer._active_runs == 0
+
+    def test_call_stack_unwound_after_exception(self, db_path):
+        """Verify a failing nested call leaves no stale entries on the call stack."""
+        import tracer
+
+        @trace
+        def outer():
+            return inner()
+
+        @trace
+        def inner():
+            assert len(tracer._call_stack.get()) == 2
+            raise RuntimeError("inner failed")
+
+        with trace_run(db_path=db_path):
+            with pytest.raises(RuntimeError):
+                outer()
+            assert tracer._call_stack.get() == ()
+
+        assert tracer._call_stack.get() == ()
+
 
 class TestTraceModule:
     """Tests for trace_module function."""
@@ -569,6 +766,34 @@ class TestTraceClass:
 
         assert len(calls) == 1
 
+    def test_trace_class_wraps_inherited_methods_once(self, db_path):
+        """Verify inherited methods are traced and overrides take precedence."""
+        class Base:
+            def greet(self):
+                return "base"
+
+            def shared(self):
+                return "base shared"
+
+        @trace_class
+        class Child(Base):
+            def shared(self):
+                return "child shared"
+
+        assert is_traced(Child.greet)
+        assert not is_traced(Base.greet)
+        assert is_traced(Child.shared)
+
+        with trace_run(db_path=db_path) as run_id:
+            assert Child().shared() == "child shared"
+
+        store = CodeStore(db_path)
+        calls = store.get_calls_for_run(run_id)
+        store.close()
+
+        assert len(calls) == 1
+        assert calls[0]['function_name'].endswith('Child.shared')
+
 
 class TestThreadSafety:
     """Tests for thread safety of tracing."""
@@ -634,6 +859,35 @@ class TestUtilityFunctions:
         assert get_original(original) is original  # Idempotent
 
 
+class TestDisableTrace:
+    """Tests for the LOOM_DISABLE_TRACE escape hatch."""
+
+    def test_disabled_tracing_is_a_no_op(self, db_path, monkeypatch):
+        """Verify decorators leave functions untouched and runs record nothing."""
+        import tracer
+        monkeypatch.setattr(tracer, '_DISABLED', True)
+
+        def plain(x):
+            return x + 1
+
+        assert trace(plain) is plain
+        assert not is_traced(trace(plain))
+
+        class Plain:
+            def method(self):
+                return 1
+
+        original_method = Plain.method
+        assert trace_class(Plain) is Plain
+        assert Plain.method is original_method
+
+        with trace_run(db_path=db_path) as run_id:
+            assert plain(1) == 2
+
+        assert run_id is None
+        assert not os.path.exists(db_path)
+
+
 class TestDuration:
     """Tests for duration tracking."""
 
@@ -658,3 +912,24 @@ class TestDuration:
         assert duration >= 50
         # But not crazy long
         assert duration < 500
+
+    def test_timestamps_bracket_the_call(self, db_path):
+        """Verify called_at/returned_at are ISO UTC times around the call."""
+        from datetime import datetime
+
+        @trace
+        def quick():
+            return 1
+
+        before = datetime.utcnow()
+        with trace_run(db_path=db_path) as run_id:
+            quick()
+        after = datetime.utcnow()
+
+        store = CodeStore(db_path)
+        call = store.get_calls_for_run(run_id)[0]
+        store.close()
+
+        called_at = datetime.fromisoformat(call['called_at'])
+        returned_at = datetime.fromisoformat(call['returned_at'])
+        assert before <= called_at <= returned_at <= after
@@ -14,9 +14,150 @@ Usage:
     ./loom todo complete <id>           # Mark a TODO as done
 """
 
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 import json
+import re
+import sqlite3
+
+try:
+    import orjson
+
+    def _json_loads(text: str):
+        """Decode stored JSON, several times faster than json.loads.
+
+        orjson rejects NaN/Infinity, which json.dumps writes for non-finite
+        floats in metadata; those values go to the stdlib decoder instead.
+        """
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            return json.loads(text)
+except ImportError:
+    _json_loads = json.loads
+
+# Queries made only of word characters and whitespace can be turned into an
+# FTS5 phrase; anything else keeps the substring (LIKE) semantics
+_FTS_SAFE_QUERY = re.compile(r'^[\w\s]+$')
+
+# clear_completed_todos() deletes in chunks of this many rows, committing in
+# between, so a large purge never holds the write lock for long
+CLEAR_BATCH_SIZE = 10000
+# One batch of that purge. The status literal must match
+# idx_todos_completed_at's WHERE clause so the planner can use the partial
+# index (a bound parameter can't prove it)
+_CLEAR_COMPLETED_SQL = """
+    DELETE FROM todos
+    WHERE id IN (
+        SELECT id FROM todos
+        WHERE status = 'completed' AND completed_at < ?
+        LIMIT ?
+    )
+"""
+
+# Fixed SQL for the hot single-row paths. Keeping the text constant means the
+# connection's statement cache (see CodeStore.__init__) always finds the
+# prepared statement instead of re-parsing it.
+# New TODOs go to the back of the queue; MAX(position) is answered from
+# idx_todos_position, so assigning it inside the INSERT costs one seek
+_INSERT_TODO_SQL = """
+    INSERT INTO todos
+    (created_at, title, prompt, context, priority, position, entity_name,
+     file_path, tags, metadata, status, estimated_minutes, critical)
+    VALUES (?, ?, ?, ?, ?,
+            (SELECT COALESCE(MAX(position), 0) + 1 FROM todos),
+            ?, ?, ?, ?, ?, ?, ?)
+"""
+_SELECT_TODO_SQL = "SELECT * FROM todos WHERE id = ?"
+_COMPLETE_TODO_SQL = """
+    UPDATE todos
+    SET status = ?, completed_at = ?,
+        metadata = json_set(coalesce(metadata, '{}'),
+                            '$.result', ?, '$.success', json(?)),
+        completion_notes = ?
+    WHERE id = ?
+"""
+# Columns for queue listings: everything but the long free-text/JSON fields
+# (context, metadata, completion_notes), which list_todos(lean=True) skips
+_TODO_LIST_COLUMNS = (
+    'id', 'title', 'prompt', 'status', 'priority', 'position', 'critical',
+    'tags', 'created_at', 'started_at', 'completed_at', 'estimated_minutes',
+    'entity_name', 'file_path', 'combined_into',
+)
+# Queue order for get_next_todo()/start_next_todo(), keyed by critical_first
+_NEXT_TODO_ORDER = {
+    True: "critical DESC, priority DESC, position ASC, created_at ASC",
+    False: "priority DESC, position ASC, created_at ASC",
+}
+
+# UPDATE ... RETURNING arrived in SQLite 3.35
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+_START_TODO_SQL = """
+    UPDATE todos
+    SET status = ?, started_at = ?
+    WHERE id = ? AND status = ?
+"""
+# Per-status counts for get_todo_stats(). (status, priority) lead the v11
+# queue indexes, so this runs as a covering-index scan without touching the
+# row payloads
+_TODO_STATS_SQL = """
+    SELECT
+        status,
+        COUNT(*) as count,
+        AVG(priority) as avg_priority
+    FROM todos
+    GROUP BY status
+"""
+
+
+@lru_cache(maxsize=256)
+def _list_todos_sql(
+    has_status: bool,
+    exclude_closed: bool,
+    has_entity: bool,
+    has_file: bool,
+    tag_count: int,
+    critical_only: bool,
+    lean: bool
+) -> str:
+    """
+    Build the list_todos() query for one combination of filters.
+
+    Memoizing by filter shape means each shape's SQL text is built once and
+    is the identical string every call, so it always hits the connection's
+    statement cache.
+    """
+    conditions = []
+    if has_status:
+        conditions.append("status = ?")
+    elif exclude_closed:
+        conditions.append("status NOT IN (?, ?)")
+    if has_entity:
+        conditions.append("entity_name LIKE ?")
+    if has_file:
+        conditions.append("file_path LIKE ?")
+    if tag_count:
+        placeholders = ','.join('?' * tag_count)
+        conditions.append(
+            f"id IN (SELECT todo_id FROM todo_tags WHERE tag IN ({placeholders}))"
+        )
+    if critical_only:
+        conditions.append("critical = 1")
+
+    where_clause = ""
+    if conditions:
+        where_clause = "WHERE " + " AND ".join(conditions)
+
+    columns = ', '.join(_TODO_LIST_COLUMNS) if lean else '*'
+    return f"""
+        SELECT {columns} FROM todos
+        {where_clause}
+        ORDER BY priority DESC, position ASC, created_at ASC
+        LIMIT ?
+    """
 
 
 class TodoMixin:
@@ -37,6 +178,46 @@ class TodoMixin:
     TODO_STATUS_COMPLETED = 'completed'
     TODO_STATUS_COMBINED = 'combined'  # Merged into another TODO
 
+    # True while inside bulk_writes(); mutators then leave the commit to it
+    _in_bulk = False
+
+    @contextmanager
+    def bulk_writes(self):
+        """
+        Group many TODO writes into a single transaction.
+
+        Mutating methods called inside the block skip their own commit, so
+        the whole batch is committed once on exit (or rolled back if the
+        block raises). Nested calls join the outer transaction.
+
+        Usage:
+            with store.bulk_writes():
+                for prompt in prompts:
+                    store.add_todo(prompt)
+        """
+        if self._in_bulk:
+            yield
+            return
+
+        if self.conn.in_transaction:
+            self.conn.commit()
+        self.conn.execute("BEGIN IMMEDIATE")
+        self._in_bulk = True
+        try:
+            yield
+        except BaseException:
+            self.conn.rollback()
+            raise
+        else:
+            self.conn.commit()
+        finally:
+            self._in_bulk = False
+
+    def _commit_todo_write(self) -> None:
+        """Commit a TODO write unless a bulk_writes() block owns the transaction."""
+        if not self._in_bulk:
+            self.conn.commit()
+
     def add_todo(
         self,
         prompt: str,
@@ -68,32 +249,85 @@ class TodoMixin:
         Returns:
             ID of the created TODO
         """
+        cursor = self.conn.execute(
+            _INSERT_TODO_SQL,
+            self._todo_insert_params(
+                prompt, title, context, priority, entity_name, file_path,
+                tags, metadata, estimated_minutes, critical
+            )
+        )
+        todo_id = cursor.lastrowid
+        if tags:
+            self._sync_todo_tags(todo_id, tags)
+        self._commit_todo_write()
+        return todo_id
+
+    def add_todos_bulk(self, items: List[Dict]) -> List[int]:
+        """
+        Add many TODOs in one transaction.
+
+        Each item is a dict of add_todo() keyword arguments ('prompt' is
+        required). Items are queued in list order.
+
+        Args:
+            items: List of TODO definitions
+
+        Returns:
+            IDs of the created TODOs, in the same order as items
+        """
+        if not items:
+            return []
+
+        with self.bulk_writes():
+            # Each row's position subquery sees the rows inserted before it
+            self.conn.executemany(
+                _INSERT_TODO_SQL,
+                [self._todo_insert_params(**item) for item in items]
+            )
+            # bulk_writes holds the write lock, so the newest rows are ours
+            cursor = self.conn.execute(
+                "SELECT id FROM todos ORDER BY id DESC LIMIT ?", (len(items),)
+            )
+            todo_ids = [row[0] for row in cursor.fetchall()][::-1]
+
+            tag_rows = [
+                (todo_id, tag)
+                for todo_id, item in zip(todo_ids, items, strict=True)
+                for tag in (item.get('tags') or ()) if tag
+            ]
+            if tag_rows:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO todo_tags (todo_id, tag) VALUES (?, ?)",
+                    tag_rows
+                )
+
+        return todo_ids
+
+    def _todo_insert_params(
+        self,
+        prompt: str,
+        title: str = None,
+        context: str = None,
+        priority: int = 0,
+        entity_name: str = None,
+        file_path: str = None,
+        tags: List[str] = None,
+        metadata: Dict = None,
+        estimated_minutes: int = None,
+        critical: bool = False
+    ) -> tuple:
+        """Build the _INSERT_TODO_SQL parameters for one new TODO."""
         timestamp = datetime.utcnow().isoformat()
-        tags_str = ','.join(tags) if tags else None
+        tags_json = json.dumps(tags) if tags else None
         metadata_json = json.dumps(metadata) if metadata else None
 
         # Auto-generate title from prompt if not provided
         if title is None:
             title = prompt[:50] + ('...' if len(prompt) > 50 else '')
 
-        # Get next position (FIFO order)
-        cursor = self.conn.execute("SELECT MAX(position) FROM todos")
-        max_pos = cursor.fetchone()[0]
-        next_position = (max_pos or 0) + 1
-
-        cursor = self.conn.execute(
-            """
-            INSERT INTO todos
-            (created_at, title, prompt, context, priority, position, entity_name,
-             file_path, tags, metadata, status, estimated_minutes, critical)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (timestamp, title, prompt, context, priority, next_position, entity_name,
-             file_path, tags_str, metadata_json, self.TODO_STATUS_PENDING,
-             estimated_minutes, 1 if critical else 0)
-        )
-        self.conn.commit()
-        return cursor.lastrowid
+        return (timestamp, title, prompt, context, priority, entity_name,
+                file_path, tags_json, metadata_json, self.TODO_STATUS_PENDING,
+                estimated_minutes, 1 if critical else 0)
 
     def get_todo(self, todo_id: int) -> Optional[Dict]:
         """
@@ -105,10 +339,7 @@ class TodoMixin:
         Returns:
             TODO dict or None if not found
         """
-        cursor = self.conn.execute(
-            "SELECT * FROM todos WHERE id = ?",
-            (todo_id,)
-        )
+        cursor = self.conn.execute(_SELECT_TODO_SQL, (todo_id,))
         row = cursor.fetchone()
         if row:
             return self._todo_row_to_dict(row)
@@ -122,7 +353,8 @@ class TodoMixin:
         tags: List[str] = None,
         limit: int = 50,
         include_completed: bool = False,
-        critical_only: bool = False
+        critical_only: bool = False,
+        lean: bool = False
     ) -> List[Dict]:
         """
         List TODOs matching criteria, ordered by priority then position (FIFO).
@@ -135,57 +367,40 @@ class TodoMixin:
             limit: Maximum number of results
             include_completed: If True, also show completed TODOs
             critical_only: If True, only show critical TODOs
+            lean: If True, omit context, metadata and completion_notes
+                (for listings that only show a summary line per TODO)
 
         Returns:
             List of TODO dicts ordered by priority (desc) then position (asc)
         """
-        conditions = []
         params = []
 
+        # Parameters are bound in the order _list_todos_sql() emits conditions
         if status:
-            conditions.append("status = ?")
             params.append(status)
         elif not include_completed:
             # Exclude completed and combined by default
-            conditions.append("status NOT IN (?, ?)")
             params.append(self.TODO_STATUS_COMPLETED)
             params.append(self.TODO_STATUS_COMBINED)
 
         if entity_name:
-            conditions.append("entity_name LIKE ?")
             params.append(f"%{entity_name}%")
 
         if file_path:
-            conditions.append("file_path LIKE ?")
             params.append(f"%{file_path}%")
 
         if tags:
-            tag_conditions = []
-            for tag in tags:
-                tag_conditions.append("tags LIKE ?")
-                params.append(f"%{tag}%")
-            conditions.append(f"({' OR '.join(tag_conditions)})")
-
-        if critical_only:
-            conditions.append("critical = 1")
-
-        where_clause = ""
-        if conditions:
-            where_clause = "WHERE " + " AND ".join(conditions)
+            params.extend(tags)
 
         params.append(limit)
 
-        cursor = self.conn.execute(
-            f"""
-            SELECT * FROM todos
-            {where_clause}
-            ORDER BY priority DESC, position ASC, created_at ASC
-            LIMIT ?
-            """,
-            params
+        sql = _list_todos_sql(
+            bool(status), not include_completed, bool(entity_name),
+            bool(file_path), len(tags) if tags else 0, bool(critical_only), bool(lean)
         )
+        cursor = self.conn.execute(sql, params)
 
-        return [self._todo_row_to_dict(row) for row in cursor.fetchall()]
+        return self._todo_rows_to_dicts(cursor)
 
     def get_next_todo(self, critical_first: bool = True) -> Optional[Dict]:
         """
@@ -197,9 +412,7 @@ class TodoMixin:
         Returns:
             The next TODO dict or None if queue is empty
         """
-        order_by = "priority DESC, position ASC, created_at ASC"
-        if critical_first:
-            order_by = "critical DESC, priority DESC, position ASC, created_at ASC"
+        order_by = _NEXT_TODO_ORDER[critical_first]
 
         cursor = self.conn.execute(
             f"""
@@ -227,15 +440,53 @@ class TodoMixin:
         """
         timestamp = datetime.utcnow().isoformat()
         cursor = self.conn.execute(
-            """
+            _START_TODO_SQL,
+            (self.TODO_STATUS_IN_PROGRESS, timestamp, todo_id, self.TODO_STATUS_PENDING)
+        )
+        self._commit_todo_write()
+        return cursor.rowcount > 0
+
+    def start_next_todo(self, critical_first: bool = True) -> Optional[Dict]:
+        """
+        Pick the next pending TODO and mark it in progress.
+
+        Equivalent to get_next_todo() followed by start_todo(), but done in a
+        single UPDATE ... RETURNING statement where SQLite supports it, so two
+        callers can never claim the same item.
+
+        Args:
+            critical_first: If True, prioritize critical TODOs over non-critical
+
+        Returns:
+            The started TODO dict or None if queue is empty
+        """
+        timestamp = datetime.utcnow().isoformat()
+
+        if not _HAS_RETURNING:
+            todo = self.get_next_todo(critical_first)
+            if not todo or not self.start_todo(todo['id']):
+                return None
+            return self.get_todo(todo['id'])
+
+        cursor = self.conn.execute(
+            f"""
             UPDATE todos
             SET status = ?, started_at = ?
-            WHERE id = ? AND status = ?
+            WHERE id = (
+                SELECT id FROM todos
+                WHERE status = ?
+                ORDER BY {_NEXT_TODO_ORDER[critical_first]}
+                LIMIT 1
+            )
+            RETURNING *
             """,
-            (self.TODO_STATUS_IN_PROGRESS, timestamp, todo_id, self.TODO_STATUS_PENDING)
+            (self.TODO_STATUS_IN_PROGRESS, timestamp, self.TODO_STATUS_PENDING)
         )
-        self.conn.commit()
-        return cursor.rowcount > 0
+        rows = cursor.fetchall()  # Step the statement to completion before committing
+        self._commit_todo_write()
+        if rows:
+            return self._todo_row_to_dict(rows[0])
+        return None
 
     def complete_todo(
         self,
@@ -260,29 +511,44 @@ class TodoMixin:
         """
         timestamp = datetime.utcnow().isoformat()
 
-        # Get existing metadata to merge
-        existing = self.get_todo(todo_id)
-        if not existing:
-            return False
-
-        metadata = existing.get('metadata') or {}
-        metadata['result'] = result
-        metadata['success'] = success
-
         # Use notes as completion_notes if completion_notes not explicitly provided
         final_notes = completion_notes or notes or result
 
+        # result/success are merged into the stored metadata by SQLite itself
         cursor = self.conn.execute(
-            """
-            UPDATE todos
-            SET status = ?, completed_at = ?, metadata = ?, completion_notes = ?
-            WHERE id = ?
-            """,
-            (self.TODO_STATUS_COMPLETED, timestamp, json.dumps(metadata), final_notes, todo_id)
+            _COMPLETE_TODO_SQL,
+            (self.TODO_STATUS_COMPLETED, timestamp, result,
+             'true' if success else 'false', final_notes, todo_id)
         )
-        self.conn.commit()
+        self._commit_todo_write()
         return cursor.rowcount > 0
 
+    def complete_and_fetch_next(
+        self,
+        todo_id: int,
+        result: str = None,
+        completion_notes: str = None,
+        success: bool = True,
+        notes: str = None
+    ) -> Tuple[bool, Optional[Dict]]:
+        """
+        Complete a TODO and fetch the next one in a single transaction.
+
+        Takes the same arguments as complete_todo(). The next TODO is read
+        under the same write lock, so it reflects exactly this completion.
+
+        Returns:
+            (completed, next_todo) - next_todo is None when the TODO was not
+            found or the queue is empty
+        """
+        with self.bulk_writes():
+            completed = self.complete_todo(
+                todo_id, result=result, completion_notes=completion_notes,
+                success=success, notes=notes
+            )
+            next_todo = self.get_next_todo() if completed else None
+        return completed, next_todo
+
     def update_todo(
         self,
         todo_id: int,
@@ -332,7 +598,7 @@ class TodoMixin:
             params.append(position)
         if tags is not None:
             updates.append("tags = ?")
-            params.append(','.join(tags) if tags else None)
+            params.append(json.dumps(tags) if tags else None)
         if estimated_minutes is not None:
             updates.append("estimated_minutes = ?")
             params.append(estimated_minutes)
@@ -355,8 +621,11 @@ class TodoMixin:
             """,
             params
         )
-        self.conn.commit()
-        return cursor.rowcount > 0
+        updated = cursor.rowcount > 0
+        if updated and tags is not None:
+            self._sync_todo_tags(todo_id, tags)
+        self._commit_todo_write()
+        return updated
 
     def combine_todos(self, keep_id: int, merge_ids: List[int], new_prompt: str = None, new_title: str = None) -> bool:
         """
@@ -383,12 +652,22 @@ class TodoMixin:
         if keep_todo.get('context'):
             merged_context_parts.append(keep_todo['context'])
 
+        # Fetch all merged TODOs in one query, then walk them in merge_ids order
+        merge_rows = {}
+        if merge_ids:
+            placeholders = ','.join('?' * len(merge_ids))
+            cursor = self.conn.execute(
+                f"SELECT id, prompt, context FROM todos WHERE id IN ({placeholders})",
+                list(merge_ids)
+            )
+            merge_rows = {row['id']: row for row in cursor.fetchall()}
+
         for merge_id in merge_ids:
-            merge_todo = self.get_todo(merge_id)
+            merge_todo = merge_rows.get(merge_id)
             if merge_todo:
                 # Add to context
                 merged_context_parts.append(f"[Merged from #{merge_id}] {merge_todo['prompt']}")
-                if merge_todo.get('context'):
+                if merge_todo['context']:
                     merged_context_parts.append(merge_todo['context'])
 
         # Update the kept TODO
@@ -411,54 +690,97 @@ class TodoMixin:
             update_params.append(new_context)
 
         update_params.append(keep_id)
-        self.conn.execute(
-            f"""
-            UPDATE todos
-            SET {', '.join(update_parts)}
-            WHERE id = ?
-            """,
-            update_params
-        )
 
-        # Mark merged TODOs as combined using the dedicated combined_into column
-        if merge_ids:
-            placeholders = ','.join('?' * len(merge_ids))
+        # Both updates commit together (or roll back together on error)
+        try:
             self.conn.execute(
                 f"""
                 UPDATE todos
-                SET status = ?, combined_into = ?, updated_at = ?
-                WHERE id IN ({placeholders})
+                SET {', '.join(update_parts)}
+                WHERE id = ?
                 """,
-                [self.TODO_STATUS_COMBINED, keep_id, timestamp] + list(merge_ids)
+                update_params
             )
 
-        self.conn.commit()
+            # Mark merged TODOs as combined using the dedicated combined_into column
+            if merge_ids:
+                self.conn.execute(
+                    f"""
+                    UPDATE todos
+                    SET status = ?, combined_into = ?, updated_at = ?
+                    WHERE id IN ({placeholders})
+                    """,
+                    [self.TODO_STATUS_COMBINED, keep_id, timestamp] + list(merge_ids)
+                )
+        except Exception:
+            if not self._in_bulk:
+                self.conn.rollback()
+            raise
+        self._commit_todo_write()
         return True
 
     def search_todos(self, query: str, limit: int = 20) -> List[Dict]:
         """
         Search TODOs by prompt or context text.
 
+        Any TODO whose prompt or context contains the query as a substring
+        matches ("Error" finds "ParseError"). Word and word-prefix matches
+        from the full-text index come first, so "auth" ranks TODOs about
+        "authentication" ahead of mid-word hits.
+
         Args:
             query: Search text
             limit: Maximum results
 
         Returns:
-            List of matching TODO dicts
+            List of matching TODO dicts: full-text matches by priority then
+            relevance, followed by the remaining substring matches by
+            priority then age
         """
+        results: List[Dict] = []
+        if _FTS_SAFE_QUERY.match(query):
+            # Phrase-prefix match, so "auth" still finds "authentication"
+            match = '"' + ' '.join(query.split()) + '" *'
+            try:
+                # CROSS JOIN keeps the FTS index as the outer loop; the status
+                # filter runs on every match before ordering and LIMIT
+                cursor = self.conn.execute(
+                    """
+                    SELECT t.* FROM todos_fts
+                    CROSS JOIN todos t ON t.id = todos_fts.rowid
+                    WHERE todos_fts MATCH ?
+                    AND t.status NOT IN (?, ?)
+                    ORDER BY t.priority DESC, bm25(todos_fts)
+                    LIMIT ?
+                    """,
+                    (match,
+                     self.TODO_STATUS_COMPLETED, self.TODO_STATUS_COMBINED,
+                     limit)
+                )
+                results = self._todo_rows_to_dicts(cursor)
+            except sqlite3.OperationalError:
+                pass  # No FTS5 table in this database; use the LIKE scan
+            if len(results) >= limit:
+                return results
+
+        # Token matching misses partial words ("bug" in "debugging"), so top
+        # up with a substring scan, skipping TODOs the index already found
+        found = [todo['id'] for todo in results]
+        exclude = f"AND id NOT IN ({','.join('?' * len(found))})" if found else ""
         cursor = self.conn.execute(
-            """
+            f"""
             SELECT * FROM todos
             WHERE (prompt LIKE ? OR context LIKE ?)
             AND status NOT IN (?, ?)
+            {exclude}
             ORDER BY priority DESC, created_at ASC
             LIMIT ?
             """,
-            (f"%{query}%", f"%{query}%",
+            [f"%{query}%", f"%{query}%",
              self.TODO_STATUS_COMPLETED, self.TODO_STATUS_COMBINED,
-             limit)
+             *found, limit - len(results)]
         )
-        return [self._todo_row_to_dict(row) for row in cursor.fetchall()]
+        return results + self._todo_rows_to_dicts(cursor)
 
     def get_todo_stats(self) -> Dict:
         """
@@ -467,16 +789,7 @@ class TodoMixin:
         Returns:
             Dict with counts by status and other stats
         """
-        cursor = self.conn.execute(
-            """
-            SELECT
-                status,
-                COUNT(*) as count,
-                AVG(priority) as avg_priority
-            FROM todos
-            GROUP BY status
-            """
-        )
+        cursor = self.conn.execute(_TODO_STATS_SQL)
 
         stats = {
             'by_status': {},
@@ -517,7 +830,7 @@ class TodoMixin:
             "DELETE FROM todos WHERE id = ?",
             (todo_id,)
         )
-        self.conn.commit()
+        self._commit_todo_write()
         return cursor.rowcount > 0
 
     def clear_completed_todos(self, days_old: int = 30) -> int:
@@ -533,15 +846,18 @@ class TodoMixin:
         from datetime import timedelta
         cutoff = (datetime.utcnow() - timedelta(days=days_old)).isoformat()
 
-        cursor = self.conn.execute(
-            """
-            DELETE FROM todos
-            WHERE status = ? AND completed_at < ?
-            """,
-            (self.TODO_STATUS_COMPLETED, cutoff)
-        )
-        self.conn.commit()
-        return cursor.rowcount
+        deleted = 0
+        while True:
+            cursor = self.conn.execute(_CLEAR_COMPLETED_SQL, (cutoff, CLEAR_BATCH_SIZE))
+            self._commit_todo_write()
+            deleted += cursor.rowcount
+            if cursor.rowcount < CLEAR_BATCH_SIZE:
+                break
+
+        # Hand the freed WAL space back once a purge is committed
+        if deleted and not self._in_bulk:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return deleted
 
     # --- Convenience aliases to match the requested API ---
 
@@ -652,11 +968,13 @@ class TodoMixin:
             True if successful, False if not found
         """
         # Get current position
-        todo = self.get_todo(todo_id)
-        if not todo:
+        row = self.conn.execute(
+            "SELECT position FROM todos WHERE id = ?", (todo_id,)
+        ).fetchone()
+        if not row:
             return False
 
-        old_position = todo.get('position')
+        old_position = row['position']
         if old_position == new_position:
             return True  # No change needed
 
@@ -668,55 +986,65 @@ class TodoMixin:
                 "UPDATE todos SET position = ?, updated_at = ? WHERE id = ?",
                 (new_position, timestamp, todo_id)
             )
-        elif new_position < old_position:
-            # Moving up: shift others down
-            self.conn.execute(
-                """
-                UPDATE todos
-                SET position = position + 1
-                WHERE position >= ? AND position < ? AND id != ?
-                """,
-                (new_position, old_position, todo_id)
-            )
-            self.conn.execute(
-                "UPDATE todos SET position = ?, updated_at = ? WHERE id = ?",
-                (new_position, timestamp, todo_id)
-            )
         else:
-            # Moving down: shift others up
+            # Moving up shifts the rows in between down, and vice versa; the
+            # shift and the move happen in one statement
+            if new_position < old_position:
+                low, high, shift = new_position, old_position - 1, 1
+            else:
+                low, high, shift = old_position + 1, new_position, -1
             self.conn.execute(
                 """
                 UPDATE todos
-                SET position = position - 1
-                WHERE position > ? AND position <= ? AND id != ?
+                SET position = CASE WHEN id = ? THEN ? ELSE position + ? END,
+                    updated_at = CASE WHEN id = ? THEN ? ELSE updated_at END
+                WHERE id = ? OR position BETWEEN ? AND ?
                 """,
-                (old_position, new_position, todo_id)
-            )
-            self.conn.execute(
-                "UPDATE todos SET position = ?, updated_at = ? WHERE id = ?",
-                (new_position, timestamp, todo_id)
+                (todo_id, new_position, shift, todo_id, timestamp,
+                 todo_id, low, high)
             )
 
-        self.conn.commit()
+        self._commit_todo_write()
         return True
 
+    def _sync_todo_tags(self, todo_id: int, tags: Optional[List[str]]) -> None:
+        """Replace the todo_tags rows for a TODO (caller commits)."""
+        self.conn.execute("DELETE FROM todo_tags WHERE todo_id = ?", (todo_id,))
+        if tags:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO todo_tags (todo_id, tag) VALUES (?, ?)",
+                [(todo_id, tag) for tag in tags if tag]
+            )
+
     def _todo_row_to_dict(self, row) -> Dict:
         """Convert a database row to a TODO dict."""
-        entry = dict(row)
-
-        # Parse tags back to list
-        if entry.get('tags'):
-            entry['tags'] = entry['tags'].split(',')
-        else:
+        return self._decode_todo_entry(dict(row))
+
+    def _todo_rows_to_dicts(self, cursor) -> List[Dict]:
+        """Convert all remaining rows of a cursor to TODO dicts."""
+        # Zipping against the column names read once per query is much
+        # cheaper than dict(row), which looks the keys up again for each row
+        columns = [d[0] for d in cursor.description]
+        decode = self._decode_todo_entry
+        return [decode(dict(zip(columns, row, strict=True))) for row in cursor.fetchall()]
+
+    def _decode_todo_entry(self, entry: Dict) -> Dict:
+        """Decode the stored tags/metadata/critical fields of a TODO dict in place."""
+        # Parse the stored JSON array of tags back to a list; one malformed
+        # value must not break every listing that includes it
+        tags = entry.get('tags')
+        try:
+            entry['tags'] = _json_loads(tags) if tags else []
+        except (ValueError, TypeError):
             entry['tags'] = []
 
-        # Parse metadata JSON
+        # Parse metadata JSON (absent from lean listings)
         if entry.get('metadata'):
             try:
-                entry['metadata'] = json.loads(entry['metadata'])
-            except (json.JSONDecodeError, TypeError):
+                entry['metadata'] = _json_loads(entry['metadata'])
+            except (ValueError, TypeError):  # orjson's JSONDecodeError is a ValueError
                 entry['metadata'] = {}
-        else:
+        elif 'metadata' in entry:
             entry['metadata'] = {}
 
         # Ensure critical is a boolean
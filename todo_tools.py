@@ -7,12 +7,55 @@ and can be queried, combined, and completed.
 
 Functions return either:
 - Formatted strings ready for LLM consumption (get_todos, next_todo, etc.)
-- Simple values for programmatic use (add_todo returns int ID)
+- Simple values for programmatic use (add_todo returns int ID, add_todos a list)
 """
 
+import re
 from typing import List, Optional, Union
 
-from loom_base import _find_store, _log_usage
+from loom_base import _get_store, _log_usage
+
+# Separator for comma-separated tag strings, swallowing surrounding whitespace
+_TAG_SEPARATOR = re.compile(r"\s*,\s*")
+
+# A comma-separated list of TODO ids, e.g. "2, 3,5"
+_ID_LIST = re.compile(r"\s*\d+(?:\s*,\s*\d+)*\s*")
+_ID = re.compile(r"\d+")
+
+# Keys an add_todos() item may have: add_todo()'s arguments, the first two
+# of which are required
+_TODO_ITEM_REQUIRED = ('title', 'prompt')
+_TODO_ITEM_KEYS = frozenset(_TODO_ITEM_REQUIRED + (
+    'context', 'tags', 'critical', 'priority', 'entity', 'file', 'estimated_minutes',
+))
+
+# Status markers used by todos()
+_STATUS_ICON = {
+    'pending': '○',
+    'in_progress': '◐',
+    'completed': '●',
+    'combined': '⊕'
+}
+
+# search_todos() marks only open TODOs; anything else shows as '?'
+_SEARCH_STATUS_ICON = {
+    'pending': '○',
+    'in_progress': '◐',
+}
+
+
+def _parse_tags(tags) -> Optional[List[str]]:
+    """Normalize tags given as a list or a comma-separated string."""
+    if not tags:
+        return None
+    if isinstance(tags, str):
+        return _TAG_SEPARATOR.split(tags.strip())
+    return list(tags)
+
+
+def _ellipsize(text: str, width: int) -> str:
+    """Cut text to width characters, marking the cut with '...'."""
+    return text if len(text) <= width else text[:width] + "..."
 
 
 def add_todo(
@@ -52,38 +95,91 @@ def add_todo(
             tags=["bug", "parser"]
         )
     """
-    store = _find_store()
+    store = _get_store()
     if not store:
         raise RuntimeError("Could not find .loom/store.db. Run './loom ingest <path>' first.")
 
-    try:
-        # Handle tags: accept both list and comma-separated string
-        tag_list = None
-        if tags:
-            if isinstance(tags, str):
-                tag_list = [t.strip() for t in tags.split(',')]
-            else:
-                tag_list = list(tags)
+    # Handle tags: accept both list and comma-separated string. Lists (the
+    # usual case) are passed through uncopied; the store serializes them
+    # immediately and never keeps a reference.
+    tag_list = tags if tags is None or type(tags) is list else _parse_tags(tags)
 
-        todo_id = store.add_todo(
-            prompt=prompt,
-            title=title,
-            context=context,
-            priority=priority,
-            entity_name=entity,
-            file_path=file,
-            tags=tag_list,
-            estimated_minutes=estimated_minutes,
-            critical=critical
-        )
+    todo_id = store.add_todo(
+        prompt=prompt,
+        title=title,
+        context=context,
+        priority=priority,
+        entity_name=entity,
+        file_path=file,
+        tags=tag_list,
+        estimated_minutes=estimated_minutes,
+        critical=critical
+    )
 
-        store.close()
-        _log_usage("add_todo", title[:50] if title else prompt[:50], f"created #{todo_id}")
-        return todo_id
+    _log_usage("add_todo", title[:50] if title else prompt[:50], f"created #{todo_id}")
+    return todo_id
 
-    except Exception as e:
-        store.close()
-        raise
+
+def add_todos(items: List[dict]) -> List[int]:
+    """Add several TODOs at once. Returns their ids in order.
+
+    Prefer this over repeated add_todo() calls when queueing more than a
+    few items (e.g. findings from a code review): all rows are written in
+    one transaction.
+
+    Args:
+        items: List of dicts taking add_todo()'s arguments ('title' and
+            'prompt' are required; 'tags' may be a list or comma-separated
+            string)
+
+    Returns:
+        List of TODO ids, in the same order as items
+
+    Raises:
+        ValueError: If an item has an unknown key or lacks 'title' or
+            'prompt'; nothing is added in that case
+
+    Example:
+        ids = add_todos([
+            {"title": "Null check in parse()", "prompt": "...", "tags": ["bug"]},
+            {"title": "Rename helper", "prompt": "...", "priority": 1},
+        ])
+    """
+    for index, item in enumerate(items):
+        unknown = item.keys() - _TODO_ITEM_KEYS
+        if unknown:
+            raise ValueError(
+                f"add_todos item {index}: unknown key(s) {', '.join(sorted(unknown))}; "
+                f"expected some of {', '.join(sorted(_TODO_ITEM_KEYS))}"
+            )
+        missing = [key for key in _TODO_ITEM_REQUIRED if key not in item]
+        if missing:
+            raise ValueError(
+                f"add_todos item {index}: missing required key(s) {', '.join(missing)}"
+            )
+
+    store = _get_store()
+    if not store:
+        raise RuntimeError("Could not find .loom/store.db. Run './loom ingest <path>' first.")
+
+    rows = [
+        {
+            'prompt': item['prompt'],
+            'title': item['title'],
+            'context': item.get('context'),
+            'priority': item.get('priority', 0),
+            'entity_name': item.get('entity'),
+            'file_path': item.get('file'),
+            'tags': _parse_tags(item.get('tags')),
+            'estimated_minutes': item.get('estimated_minutes'),
+            'critical': item.get('critical', False),
+        }
+        for item in items
+    ]
+    todo_ids = store.add_todos_bulk(rows)
+
+    _log_usage("add_todos", f"{len(todo_ids)} items", f"created {len(todo_ids)}")
+    return todo_ids
 
 
 def add_todo_verbose(
@@ -122,12 +218,12 @@ def add_todo_verbose(
         add_todo_verbose("Refactor database queries", priority=2, tags="performance,refactor")
         add_todo_verbose("Fix critical security hole", critical=True, estimated_minutes=30)
     """
-    store = _find_store()
+    store = _get_store()
     if not store:
         return "Error: Could not find .loom/store.db. Run './loom ingest <path>' first."
 
     try:
-        tag_list = [t.strip() for t in tags.split(',')] if tags else None
+        tag_list = _parse_tags(tags)
 
         todo_id = store.add_todo(
             prompt=prompt,
@@ -141,8 +237,6 @@ def add_todo_verbose(
             critical=critical
         )
 
-        store.close()
-
         lines = [f"Added TODO #{todo_id}"]
         if title:
             lines.append(f"  Title: {title}")
@@ -164,7 +258,6 @@ def add_todo_verbose(
         return result
 
     except Exception as e:
-        store.close()
         return f"Error adding TODO: {e}"
 
 
@@ -196,7 +289,7 @@ def todos(
         todos(entity="CodeStore")        # TODOs related to CodeStore
         todos(critical_only=True)        # Only critical items
     """
-    store = _find_store()
+    store = _get_store()
     if not store:
         return "Error: Could not find .loom/store.db. Run './loom ingest <path>' first."
 
@@ -211,69 +304,67 @@ def todos(
             critical_only=critical_only
         )
 
-        store.close()
-
         if not todo_list:
             result = f"No TODOs with status '{status}'" if status else "No pending TODOs. Queue is empty."
             _log_usage("todos", f"status={status}", "0 items")
             return result
 
         lines = [f"TODOs ({len(todo_list)} items):", ""]
+        append = lines.append
+        status_icon = _STATUS_ICON.get
 
         for todo in todo_list:
-            status_icon = {
-                'pending': '○',
-                'in_progress': '◐',
-                'completed': '●',
-                'combined': '⊕'
-            }.get(todo['status'], '?')
+            get = todo.get
+            prompt = todo['prompt']
+            title = get('title')
+            priority = get('priority', 0)
+            position = get('position')
+            context = get('context')
+            estimated_minutes = get('estimated_minutes')
+            entity_name = get('entity_name')
+            file_path = get('file_path')
+            tags = get('tags')
 
             # Build info tags
             info_tags = []
-            if todo.get('priority', 0) > 0:
-                info_tags.append(f"P{todo['priority']}")
-            if todo.get('critical'):
+            if priority > 0:
+                info_tags.append(f"P{priority}")
+            if get('critical'):
                 info_tags.append("CRITICAL")
-            if todo.get('position'):
-                info_tags.append(f"#{todo['position']}")
+            if position:
+                info_tags.append(f"#{position}")
 
             info_str = f" [{', '.join(info_tags)}]" if info_tags else ""
 
             # Use title if available, otherwise first part of prompt
-            display_text = todo.get('title') or todo['prompt']
-
-            lines.append(f"{status_icon} #{todo['id']}{info_str}: {display_text}")
+            append(f"{status_icon(todo['status'], '?')} #{todo['id']}{info_str}: {title or prompt}")
 
             # Show full prompt if title is different
-            if todo.get('title') and todo['title'] != todo['prompt']:
-                lines.append(f"   Prompt: {todo['prompt'][:100]}{'...' if len(todo['prompt']) > 100 else ''}")
+            if title and title != prompt:
+                append(f"   Prompt: {_ellipsize(prompt, 100)}")
 
-            if todo.get('context'):
-                context_preview = todo['context'][:80]
-                if len(todo['context']) > 80:
-                    context_preview += "..."
-                lines.append(f"   Context: {context_preview}")
+            if context:
+                append(f"   Context: {_ellipsize(context, 80)}")
 
-            if todo.get('estimated_minutes'):
-                lines.append(f"   Estimate: {todo['estimated_minutes']} min")
+            if estimated_minutes:
+                append(f"   Estimate: {estimated_minutes} min")
 
-            if todo.get('entity_name'):
-                lines.append(f"   Entity: {todo['entity_name']}")
+            if entity_name:
+                append(f"   Entity: {entity_name}")
 
-            if todo.get('file_path'):
-                lines.append(f"   File: {todo['file_path']}")
+            if file_path:
+                append(f"   File: {file_path}")
 
-            if todo.get('tags'):
-                lines.append(f"   Tags: {', '.join(todo['tags'])}")
+            if tags:
+                append(f"   Tags: {', '.join(tags)}")
 
-            lines.append("")
+            append("")
 
         result = "\n".join(lines)
         _log_usage("todos", f"status={status}", f"{len(todo_list)} items")
         return result
 
     except Exception as e:
-        store.close()
         return f"Error listing TODOs: {e}"
 
 
@@ -297,6 +388,34 @@ def get_todos(status: str = 'pending', limit: int = 10) -> str:
     return todos(status=status, limit=limit)
 
 
+def list_todos_raw(status: str = 'pending', limit: int = 10) -> List[dict]:
+    """Get TODOs as dicts, for programmatic use.
+
+    Same selection as get_todos(), but skips the text formatting.
+
+    Args:
+        status: Filter by status - 'pending', 'in_progress', 'completed' (default 'pending')
+        limit: Maximum number of TODOs to return (default 10)
+
+    Returns:
+        List of TODO dicts (id, title, prompt, status, priority, tags, ...)
+
+    Example:
+        ids = [t['id'] for t in list_todos_raw()]
+    """
+    store = _get_store()
+    if not store:
+        raise RuntimeError("Could not find .loom/store.db. Run './loom ingest <path>' first.")
+
+    todo_list = store.list_todos(
+        status=status,
+        limit=limit,
+        include_completed=(status == 'completed')
+    )
+    _log_usage("list_todos_raw", f"status={status}", f"{len(todo_list)} items")
+    return todo_list
+
+
 def next_todo() -> str:
     """
     Get the next TODO to work on (highest priority pending, FIFO).
@@ -310,59 +429,51 @@ def next_todo() -> str:
     Example:
         next_todo()  # What should I work on next?
     """
-    store = _find_store()
+    store = _get_store()
     if not store:
         return "Error: Could not find .loom/store.db. Run './loom ingest <path>' first."
 
     try:
         todo = store.get_next_todo()
-        store.close()
 
         if not todo:
             _log_usage("next_todo", "", "queue empty")
             return "No pending TODOs. Queue is empty."
 
-        # Build header with title or prompt
-        header = todo.get('title') or todo['prompt']
-        lines = [f"Next TODO: #{todo['id']} - {header}"]
-
-        if todo.get('critical'):
-            lines.append("  ** CRITICAL - Blocks subsequent work on failure **")
-
-        if todo.get('title') and todo['title'] != todo['prompt']:
-            lines.append(f"  Prompt: {todo['prompt']}")
-
-        if todo.get('priority', 0) > 0:
-            lines.append(f"  Priority: {todo['priority']}")
-
-        if todo.get('position'):
-            lines.append(f"  Position: #{todo['position']} in queue")
-
-        if todo.get('estimated_minutes'):
-            lines.append(f"  Estimate: {todo['estimated_minutes']} minutes")
-
-        if todo.get('context'):
-            lines.append(f"  Context: {todo['context']}")
-
-        if todo.get('entity_name'):
-            lines.append(f"  Entity: {todo['entity_name']}")
-
-        if todo.get('file_path'):
-            lines.append(f"  File: {todo['file_path']}")
-
-        if todo.get('tags'):
-            lines.append(f"  Tags: {', '.join(todo['tags'])}")
-
-        lines.append("")
-        lines.append(f"Use start_todo({todo['id']}) to mark as in-progress")
-        lines.append(f"Use complete_todo({todo['id']}) when done")
+        get = todo.get
+        todo_id = todo['id']
+        prompt = todo['prompt']
+        title = get('title')
+        priority = get('priority', 0)
+        position = get('position')
+        estimated_minutes = get('estimated_minutes')
+        context = get('context')
+        entity_name = get('entity_name')
+        file_path = get('file_path')
+        tags = get('tags')
+
+        # Optional lines are None when absent and dropped by the join below
+        parts = (
+            f"Next TODO: #{todo_id} - {title or prompt}",
+            "  ** CRITICAL - Blocks subsequent work on failure **" if get('critical') else None,
+            f"  Prompt: {prompt}" if title and title != prompt else None,
+            f"  Priority: {priority}" if priority > 0 else None,
+            f"  Position: #{position} in queue" if position else None,
+            f"  Estimate: {estimated_minutes} minutes" if estimated_minutes else None,
+            f"  Context: {context}" if context else None,
+            f"  Entity: {entity_name}" if entity_name else None,
+            f"  File: {file_path}" if file_path else None,
+            f"  Tags: {', '.join(tags)}" if tags else None,
+            "",
+            f"Use start_todo({todo_id}) to mark as in-progress",
+            f"Use complete_todo({todo_id}) when done",
+        )
 
-        result = "\n".join(lines)
-        _log_usage("next_todo", "", f"#{todo['id']}")
+        result = "\n".join([part for part in parts if part is not None])
+        _log_usage("next_todo", "", f"#{todo_id}")
         return result
 
     except Exception as e:
-        store.close()
         return f"Error getting next TODO: {e}"
 
 
@@ -381,25 +492,21 @@ def start_todo(todo_id: int) -> str:
     Example:
         start_todo(5)  # Start working on TODO #5
     """
-    store = _find_store()
+    store = _get_store()
     if not store:
         return "Error: Could not find .loom/store.db. Run './loom ingest <path>' first."
 
     try:
         success = store.start_todo(todo_id)
-        store.close()
-
-        if success:
-            _log_usage("start_todo", str(todo_id), "started")
-            return f"Started TODO #{todo_id}"
-        else:
-            _log_usage("start_todo", str(todo_id), "not found")
-            return f"Could not start TODO #{todo_id} - not found or not pending"
-
     except Exception as e:
-        store.close()
         return f"Error starting TODO: {e}"
 
+    if success:
+        _log_usage("start_todo", str(todo_id), "started")
+        return f"Started TODO #{todo_id}"
+    _log_usage("start_todo", str(todo_id), "not found")
+    return f"Could not start TODO #{todo_id} - not found or not pending"
+
 
 def complete_todo(todo_id: int, notes: str = None, result: str = None) -> str:
     """Mark a TODO as completed.
@@ -418,7 +525,7 @@ def complete_todo(todo_id: int, notes: str = None, result: str = None) -> str:
         complete_todo(5)                              # Done with TODO #5
         complete_todo(5, notes="Fixed by adding null check")  # With notes
     """
-    store = _find_store()
+    store = _get_store()
     if not store:
         return "Error: Could not find .loom/store.db. Run './loom ingest <path>' first."
 
@@ -426,17 +533,13 @@ def complete_todo(todo_id: int, notes: str = None, result: str = None) -> str:
         # Support both 'notes' and 'result' params
         completion_notes = notes or result
 
-        success = store.complete_todo(todo_id, result=completion_notes)
+        # Also fetch the next TODO to suggest, in the same transaction
+        success, next_item = store.complete_and_fetch_next(todo_id, result=completion_notes)
 
         if not success:
-            store.close()
             _log_usage("complete_todo", str(todo_id), "not found")
             return f"Could not complete TODO #{todo_id} - not found"
 
-        # Get the next TODO to suggest
-        next_item = store.get_next_todo()
-        store.close()
-
         lines = [f"Completed TODO #{todo_id}"]
         if completion_notes:
             lines.append(f"  Notes: {completion_notes}")
@@ -449,7 +552,6 @@ def complete_todo(todo_id: int, notes: str = None, result: str = None) -> str:
         return "\n".join(lines)
 
     except Exception as e:
-        store.close()
         return f"Error completing TODO: {e}"
 
 
@@ -472,15 +574,16 @@ def combine_todos(keep_id: int, merge_ids: str, new_prompt: str = None) -> str:
         combine_todos(1, "2,3")  # Merge #2 and #3 into #1
         combine_todos(1, "2,3", new_prompt="Fix all auth issues")
     """
-    store = _find_store()
+    store = _get_store()
     if not store:
         return "Error: Could not find .loom/store.db. Run './loom ingest <path>' first."
 
     try:
-        merge_id_list = [int(x.strip()) for x in merge_ids.split(',')]
+        if not _ID_LIST.fullmatch(merge_ids):
+            raise ValueError(f"expected comma-separated ids, got {merge_ids!r}")
+        merge_id_list = list(map(int, _ID.findall(merge_ids)))
 
         success = store.combine_todos(keep_id, merge_id_list, new_prompt=new_prompt)
-        store.close()
 
         if success:
             _log_usage("combine_todos", f"{keep_id} <- {merge_ids}", "combined")
@@ -490,10 +593,8 @@ def combine_todos(keep_id: int, merge_ids: str, new_prompt: str = None) -> str:
             return f"Could not combine - TODO #{keep_id} not found"
 
     except ValueError as e:
-        store.close()
         return f"Invalid ID format: {e}"
     except Exception as e:
-        store.close()
         return f"Error combining TODOs: {e}"
 
 
@@ -528,12 +629,12 @@ def update_todo(
         update_todo(5, context="Now blocking release")
         update_todo(5, critical=True)  # Mark as critical
     """
-    store = _find_store()
+    store = _get_store()
     if not store:
         return "Error: Could not find .loom/store.db. Run './loom ingest <path>' first."
 
     try:
-        tag_list = [t.strip() for t in tags.split(',')] if tags else None
+        tag_list = _parse_tags(tags)
 
         success = store.update_todo(
             todo_id,
@@ -545,7 +646,6 @@ def update_todo(
             estimated_minutes=estimated_minutes,
             critical=critical
         )
-        store.close()
 
         if success:
             _log_usage("update_todo", str(todo_id), "updated")
@@ -555,7 +655,6 @@ def update_todo(
             return f"Could not update TODO #{todo_id} - not found or no changes"
 
     except Exception as e:
-        store.close()
         return f"Error updating TODO: {e}"
 
 
@@ -574,40 +673,33 @@ def search_todos(query: str, limit: int = 10) -> str:
         search_todos("authentication")
         search_todos("refactor")
     """
-    store = _find_store()
+    store = _get_store()
     if not store:
         return "Error: Could not find .loom/store.db. Run './loom ingest <path>' first."
 
     try:
         results = store.search_todos(query, limit=limit)
-        store.close()
 
         if not results:
             _log_usage("search_todos", query, "0 matches")
             return f"No TODOs matching '{query}'"
 
         lines = [f"TODOs matching '{query}' ({len(results)} found):", ""]
+        append = lines.append
 
         for todo in results:
-            status_icon = {
-                'pending': '○',
-                'in_progress': '◐',
-            }.get(todo['status'], '?')
-
-            lines.append(f"{status_icon} #{todo['id']}: {todo['prompt']}")
-            if todo.get('context'):
-                context_preview = todo['context'][:60]
-                if len(todo['context']) > 60:
-                    context_preview += "..."
-                lines.append(f"   {context_preview}")
-            lines.append("")
+            status_icon = _SEARCH_STATUS_ICON.get(todo['status'], '?')
+            append(f"{status_icon} #{todo['id']}: {todo['prompt']}")
+            context = todo.get('context')
+            if context:
+                append(f"   {_ellipsize(context, 60)}")
+            append("")
 
         result = "\n".join(lines)
         _log_usage("search_todos", query, f"{len(results)} matches")
         return result
 
     except Exception as e:
-        store.close()
         return f"Error searching TODOs: {e}"
 
 
@@ -621,13 +713,12 @@ def todo_stats() -> str:
     Example:
         todo_stats()  # How many TODOs do we have?
     """
-    store = _find_store()
+    store = _get_store()
     if not store:
         return "Error: Could not find .loom/store.db. Run './loom ingest <path>' first."
 
     try:
         stats = store.get_todo_stats()
-        store.close()
 
         lines = [
             "TODO Statistics",
@@ -643,7 +734,6 @@ def todo_stats() -> str:
         return result
 
     except Exception as e:
-        store.close()
         return f"Error getting stats: {e}"
 
 
@@ -662,13 +752,12 @@ def delete_todo(todo_id: int) -> str:
     Example:
         delete_todo(5)  # Remove TODO #5
     """
-    store = _find_store()
+    store = _get_store()
     if not store:
         return "Error: Could not find .loom/store.db. Run './loom ingest <path>' first."
 
     try:
         success = store.delete_todo(todo_id)
-        store.close()
 
         if success:
             _log_usage("delete_todo", str(todo_id), "deleted")
@@ -678,7 +767,6 @@ def delete_todo(todo_id: int) -> str:
             return f"Could not delete TODO #{todo_id} - not found"
 
     except Exception as e:
-        store.close()
         return f"Error deleting TODO: {e}"
 
 
@@ -699,13 +787,12 @@ def reorder_todo(todo_id: int, new_position: int) -> str:
         reorder_todo(5, 1)  # Move TODO #5 to front of queue
         reorder_todo(3, 10) # Move TODO #3 to position 10
     """
-    store = _find_store()
+    store = _get_store()
     if not store:
         return "Error: Could not find .loom/store.db. Run './loom ingest <path>' first."
 
     try:
         success = store.reorder_todo(todo_id, new_position)
-        store.close()
 
         if success:
             _log_usage("reorder_todo", f"{todo_id} -> {new_position}", "reordered")
@@ -715,5 +802,4 @@ def reorder_todo(todo_id: int, new_position: int) -> str:
             return f"Could not reorder TODO #{todo_id} - not found"
 
     except Exception as e:
-        store.close()
         return f"Error reordering TODO: {e}"
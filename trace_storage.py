@@ -9,7 +9,58 @@ managing trace runs, and querying trace data.
 import json
 import uuid
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, Iterator, List, Dict, Any
+
+try:
+    import orjson
+
+    def _json_loads(text: str) -> Any:
+        """Decode a stored payload, several times faster than json.loads.
+
+        orjson rejects the NaN/Infinity tokens that _safe_serialize keeps for
+        non-finite floats; those payloads go to the stdlib decoder instead.
+        """
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            return json.loads(text)
+except ImportError:
+    _json_loads = json.loads
+
+
+# trace_calls payload columns and the keys their decoded values are stored under
+_CALL_JSON_FIELDS = (
+    ('args_json', 'args'),
+    ('kwargs_json', 'kwargs'),
+    ('return_value_json', 'return_value'),
+)
+
+
+# Every trace_calls column except the payloads, in table order. Queries with
+# include_args=False select only these, so SQLite never reads the payload text.
+_CALL_LIGHT_COLUMNS = (
+    "call_id, run_id, function_name, file_path, line_number, called_at, "
+    "returned_at, duration_ms, exception_type, exception_message, "
+    "exception_traceback, parent_call_id, depth"
+)
+
+
+def _loads_or_none(text: str) -> Any:
+    """Decode a stored JSON payload, or return None if it is malformed."""
+    try:
+        return _json_loads(text)
+    except json.JSONDecodeError:
+        return None
+
+
+_INSERT_CALL_SQL = """
+    INSERT INTO trace_calls (
+        call_id, run_id, function_name, file_path, line_number,
+        called_at, returned_at, duration_ms, args_json, kwargs_json,
+        return_value_json, exception_type, exception_message,
+        exception_traceback, parent_call_id, depth
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
 
 
 class TraceMixin:
@@ -20,12 +71,23 @@ class TraceMixin:
     - self.conn: sqlite3 connection with Row factory
     - self.MAX_SERIALIZED_SIZE: int constant for serialization limits
     - self._safe_serialize: method for safe JSON serialization
+    - self._trace_buffer: list of trace_calls rows not yet written
+
+    Recorded calls are buffered and written with a single executemany() and
+    commit per batch, so a trace run costs one transaction per TRACE_BATCH_SIZE
+    calls instead of one per call. Query methods flush the buffer first.
 
     Usage:
         class CodeStore(TraceMixin, ...):
             ...
     """
 
+    # Number of buffered calls that triggers a write
+    TRACE_BATCH_SIZE = 1000
+
+    # Rows fetched per step by iter_calls_for_run()
+    TRACE_FETCH_SIZE = 1000
+
     def start_trace_run(self, command: str = None) -> str:
         """
         Start a new trace run.
@@ -63,6 +125,7 @@ class TraceMixin:
         Returns:
             True if the run was updated, False if not found
         """
+        self.flush_trace_calls()
         ended_at = datetime.utcnow().isoformat()
 
         cursor = self.conn.execute(
@@ -88,11 +151,16 @@ class TraceMixin:
         exception_message: str = None,
         exception_traceback: str = None,
         parent_call_id: str = None,
-        depth: int = 0
+        depth: int = 0,
+        call_id: str = None
     ) -> str:
         """
         Record a function call within a trace run.
 
+        The call is buffered and written on the next flush_trace_calls(), which
+        happens automatically every TRACE_BATCH_SIZE calls, when the run ends,
+        before any trace query and when the store is closed.
+
         Args:
             run_id: The ID of the trace run
             function_name: Fully qualified function name (e.g., module.class.method)
@@ -109,37 +177,70 @@ class TraceMixin:
             exception_traceback: Full traceback string
             parent_call_id: ID of the parent call for nested calls
             depth: Nesting depth (0 for top-level calls)
+            call_id: Pre-allocated call ID (generated if not provided)
 
         Returns:
             The call_id for the recorded call
         """
-        call_id = str(uuid.uuid4())
+        if call_id is None:
+            call_id = str(uuid.uuid4())
 
         if called_at is None:
             called_at = datetime.utcnow().isoformat()
 
-        # Safely serialize args, kwargs, and return value
-        args_json = self._safe_serialize(args) if args is not None else None
-        kwargs_json = self._safe_serialize(kwargs) if kwargs is not None else None
+        # Safely serialize args, kwargs, and return value. Empty args and
+        # kwargs (the common case) have a fixed encoding; skip the serializer.
+        if args is None:
+            args_json = None
+        else:
+            args_json = self._safe_serialize(args) if args else '[]'
+        if kwargs is None:
+            kwargs_json = None
+        else:
+            kwargs_json = self._safe_serialize(kwargs) if kwargs else '{}'
         return_value_json = self._safe_serialize(return_value) if return_value is not None else None
 
-        self.conn.execute(
-            """
-            INSERT INTO trace_calls (
-                call_id, run_id, function_name, file_path, line_number,
-                called_at, returned_at, duration_ms, args_json, kwargs_json,
-                return_value_json, exception_type, exception_message,
-                exception_traceback, parent_call_id, depth
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+        self._trace_buffer.append(
             (call_id, run_id, function_name, file_path, line_number,
              called_at, returned_at, duration_ms, args_json, kwargs_json,
              return_value_json, exception_type, exception_message,
              exception_traceback, parent_call_id, depth)
         )
-        self.conn.commit()
+        if len(self._trace_buffer) >= self.TRACE_BATCH_SIZE:
+            self.flush_trace_calls()
         return call_id
 
+    def record_calls(self, rows: List[tuple]) -> None:
+        """
+        Buffer already-serialized trace_calls rows.
+
+        Used by the tracer's background writer, which receives rows that were
+        serialized on the calling thread. Each row holds the 16 trace_calls
+        columns in table order (call_id ... depth).
+
+        Args:
+            rows: List of trace_calls row tuples
+        """
+        self._trace_buffer.extend(rows)
+        if len(self._trace_buffer) >= self.TRACE_BATCH_SIZE:
+            self.flush_trace_calls()
+
+    def flush_trace_calls(self) -> int:
+        """
+        Write all buffered calls in a single transaction.
+
+        Returns:
+            Number of calls written
+        """
+        if not self._trace_buffer:
+            return 0
+
+        rows = self._trace_buffer
+        self._trace_buffer = []
+        self.conn.executemany(_INSERT_CALL_SQL, rows)
+        self.conn.commit()
+        return len(rows)
+
     def get_trace_run(self, run_id: str) -> Optional[Dict]:
         """
         Get a trace run by ID.
@@ -150,6 +251,7 @@ class TraceMixin:
         Returns:
             Dict with run details, or None if not found
         """
+        self.flush_trace_calls()
         row = self.conn.execute(
             "SELECT * FROM trace_runs WHERE run_id = ?",
             (run_id,)
@@ -173,47 +275,47 @@ class TraceMixin:
         Returns:
             List of call dicts, ordered by called_at
         """
-        query = "SELECT * FROM trace_calls WHERE run_id = ?"
+        return list(self.iter_calls_for_run(run_id, include_args, only_exceptions))
+
+    def iter_calls_for_run(
+        self,
+        run_id: str,
+        include_args: bool = True,
+        only_exceptions: bool = False
+    ) -> Iterator[Dict]:
+        """
+        Iterate over the calls for a trace run without loading them all.
+
+        Same rows as get_calls_for_run(), fetched TRACE_FETCH_SIZE at a time,
+        so memory stays flat however long the run was.
+
+        Args:
+            run_id: The ID of the run
+            include_args: If True, include serialized args/kwargs/return values
+            only_exceptions: If True, only return calls that raised exceptions
+
+        Yields:
+            Call dicts, ordered by called_at
+        """
+        self.flush_trace_calls()
+        columns = '*' if include_args else _CALL_LIGHT_COLUMNS
+        query = f"SELECT {columns} FROM trace_calls WHERE run_id = ?"
         params = [run_id]
 
         if only_exceptions:
             query += " AND exception_type IS NOT NULL"
 
-        query += " ORDER BY called_at"
-
-        rows = self.conn.execute(query, params).fetchall()
-        results = []
-
-        for row in rows:
-            call = dict(row)
-            # Parse JSON fields
-            if call.get('args_json'):
-                try:
-                    call['args'] = json.loads(call['args_json'])
-                except json.JSONDecodeError:
-                    call['args'] = None
-            if call.get('kwargs_json'):
-                try:
-                    call['kwargs'] = json.loads(call['kwargs_json'])
-                except json.JSONDecodeError:
-                    call['kwargs'] = None
-            if call.get('return_value_json'):
-                try:
-                    call['return_value'] = json.loads(call['return_value_json'])
-                except json.JSONDecodeError:
-                    call['return_value'] = None
-
-            if not include_args:
-                call.pop('args_json', None)
-                call.pop('kwargs_json', None)
-                call.pop('return_value_json', None)
-                call.pop('args', None)
-                call.pop('kwargs', None)
-                call.pop('return_value', None)
-
-            results.append(call)
-
-        return results
+        # Calls are written when they return, so break called_at ties by depth
+        # to keep a parent ahead of a child that started in the same microsecond
+        query += " ORDER BY called_at, depth"
+
+        cursor = self.conn.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(self.TRACE_FETCH_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                yield self._call_row_to_dict(row, include_args)
 
     def get_recent_calls(
         self,
@@ -232,45 +334,33 @@ class TraceMixin:
         Returns:
             List of call dicts, ordered by most recent first
         """
+        self.flush_trace_calls()
+
         # Support both exact match and LIKE patterns
-        if '%' in function_name:
-            query = "SELECT * FROM trace_calls WHERE function_name LIKE ? ORDER BY called_at DESC LIMIT ?"
-        else:
-            query = "SELECT * FROM trace_calls WHERE function_name = ? ORDER BY called_at DESC LIMIT ?"
-
-        rows = self.conn.execute(query, (function_name, limit)).fetchall()
-        results = []
-
-        for row in rows:
-            call = dict(row)
-            # Parse JSON fields
-            if call.get('args_json'):
-                try:
-                    call['args'] = json.loads(call['args_json'])
-                except json.JSONDecodeError:
-                    call['args'] = None
-            if call.get('kwargs_json'):
-                try:
-                    call['kwargs'] = json.loads(call['kwargs_json'])
-                except json.JSONDecodeError:
-                    call['kwargs'] = None
-            if call.get('return_value_json'):
-                try:
-                    call['return_value'] = json.loads(call['return_value_json'])
-                except json.JSONDecodeError:
-                    call['return_value'] = None
-
-            if not include_args:
-                call.pop('args_json', None)
-                call.pop('kwargs_json', None)
-                call.pop('return_value_json', None)
-                call.pop('args', None)
-                call.pop('kwargs', None)
-                call.pop('return_value', None)
-
-            results.append(call)
-
-        return results
+        columns = '*' if include_args else _CALL_LIGHT_COLUMNS
+        operator = 'LIKE' if '%' in function_name else '='
+        query = (
+            f"SELECT {columns} FROM trace_calls WHERE function_name {operator} ? "
+            "ORDER BY called_at DESC LIMIT ?"
+        )
+
+        cursor = self.conn.execute(query, (function_name, limit))
+        return [self._call_row_to_dict(row, include_args) for row in cursor]
+
+    def _call_row_to_dict(self, row, include_args: bool) -> Dict:
+        """
+        Convert a trace_calls row to a dict, decoding its JSON fields.
+
+        Rows selected without the payload columns (include_args=False) are
+        returned as they are.
+        """
+        call = dict(row)
+        if include_args:
+            for column, key in _CALL_JSON_FIELDS:
+                text = call[column]
+                if text:
+                    call[key] = _loads_or_none(text)
+        return call
 
     def get_failed_calls(self, run_id: str = None, limit: int = 50) -> List[Dict]:
         """
@@ -283,6 +373,7 @@ class TraceMixin:
         Returns:
             List of call dicts with exception information
         """
+        self.flush_trace_calls()
         if run_id:
             query = """
                 SELECT c.*, r.command, r.status as run_status
@@ -316,6 +407,7 @@ class TraceMixin:
         Returns:
             Dict with counts and summary statistics
         """
+        self.flush_trace_calls()
         if run_id:
             run = self.get_trace_run(run_id)
             if not run:
@@ -355,13 +447,12 @@ class TraceMixin:
                 "SELECT COUNT(*) FROM trace_calls WHERE exception_type IS NOT NULL"
             ).fetchone()[0]
 
-            # Most called functions
+            # Most called functions, from the trigger-maintained counts
             top_functions = self.conn.execute(
                 """
-                SELECT function_name, COUNT(*) as count
-                FROM trace_calls
-                GROUP BY function_name
-                ORDER BY count DESC
+                SELECT function_name, call_count
+                FROM trace_function_counts
+                ORDER BY call_count DESC
                 LIMIT 10
                 """
             ).fetchall()
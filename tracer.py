@@ -13,16 +13,27 @@ Usage:
     with trace_run(command="my_script.py") as run_id:
         result = my_function(1, 2)
         # All traced functions are recorded to .loom/store.db
+
+Set LOOM_DISABLE_TRACE=1 in the environment to turn tracing off at import:
+@trace, trace_module and trace_class leave functions unwrapped, and
+trace_run records nothing and yields None.
 """
 
-from functools import wraps
+from functools import cache, lru_cache, wraps
+from itertools import count
+from fnmatch import translate
 from contextlib import contextmanager
+from contextvars import ContextVar
+import queue
+import re
 import threading
-import time
+from time import perf_counter_ns, time_ns
 import traceback
 import inspect
-from datetime import datetime
-from typing import Any, Callable, Optional, TypeVar, Set
+import types
+import warnings
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterable, Optional, TypeVar, Set
 import os
 
 # Lazy import to avoid circular dependencies
@@ -38,29 +49,55 @@ def _get_codestore():
     return _codestore
 
 
-# Thread-local storage for current run and call stack
+# Thread-local storage for the current run. run_state holds everything the
+# active path needs as one (run_id, serialize, call_queue, accepts,
+# next_call_id) tuple, so a traced call does a single thread-local lookup.
 _trace_context = threading.local()
 
+# Call IDs of the traced calls currently executing, innermost last. A context
+# variable rather than a thread-local attribute: one C-level lookup per call,
+# and each new thread (or asyncio task) sees its own stack.
+_call_stack: ContextVar[tuple] = ContextVar('loom_call_stack', default=())
+
+# Number of trace runs active in any thread. While this is zero, traced
+# functions skip the thread-local lookup entirely (one global load per call).
+_active_runs = 0
+_active_runs_lock = threading.Lock()
+
 # Set of function IDs that are part of the tracer itself (to avoid infinite recursion)
 _tracer_functions: Set[int] = set()
 
+# Tracing switched off for the whole process (decorators become no-ops)
+_DISABLED = os.environ.get('LOOM_DISABLE_TRACE') == '1'
+
 # Maximum depth to prevent runaway recursion
 MAX_TRACE_DEPTH = 100
 
+# Maximum number of queued calls the writer thread hands to the store at once
+WRITER_BATCH_SIZE = 512
+
+# Queue sentinel telling the writer thread that the run has ended
+_WRITER_STOP = object()
+
+# Naive UTC epoch, so epoch + time_ns() matches datetime.utcnow()
+_EPOCH = datetime(1970, 1, 1)
+
 F = TypeVar('F', bound=Callable[..., Any])
 
 
 def _is_tracing_active() -> bool:
     """Check if tracing is currently active in this thread."""
-    return getattr(_trace_context, 'run_id', None) is not None
+    return getattr(_trace_context, 'run_state', None) is not None
 
 
 def _get_current_context() -> tuple:
-    """Get (run_id, parent_call_id, depth, store) from thread-local context."""
+    """Get (run_id, parent_call_id, depth, store) from the current context."""
+    call_stack = _call_stack.get()
+    run_state = getattr(_trace_context, 'run_state', None)
     return (
-        getattr(_trace_context, 'run_id', None),
-        getattr(_trace_context, 'call_stack', [])[-1] if getattr(_trace_context, 'call_stack', []) else None,
-        len(getattr(_trace_context, 'call_stack', [])),
+        run_state[0] if run_state else None,
+        call_stack[-1] if call_stack else None,
+        len(call_stack),
         getattr(_trace_context, 'store', None),
     )
 
@@ -76,21 +113,33 @@ def _get_function_info(func: Callable) -> tuple:
     else:
         function_name = qualname
 
-    # Get source file and line number
-    try:
-        file_path = inspect.getfile(func)
+    # Get source file and line number. Functions name their file on the code
+    # object; inspect.getfile() is only needed for other callables.
+    code = getattr(func, '__code__', None)
+    if isinstance(code, types.CodeType):
+        file_path = code.co_filename
+    else:
+        try:
+            file_path = inspect.getfile(func)
+        except (TypeError, OSError):
+            file_path = None
+    if file_path is not None:
         # Make path relative if possible
         try:
             file_path = os.path.relpath(file_path)
         except ValueError:
             pass  # Different drives on Windows
-    except (TypeError, OSError):
-        file_path = None
 
-    try:
-        _, line_number = inspect.getsourcelines(func)
-    except (TypeError, OSError):
-        line_number = None
+    # Plain functions carry their first line on the code object, which saves
+    # getsourcelines() reading and tokenizing the source file
+    code = getattr(inspect.unwrap(func), '__code__', None)
+    if code is not None:
+        line_number = code.co_firstlineno
+    else:
+        try:
+            _, line_number = inspect.getsourcelines(func)
+        except (TypeError, OSError):
+            line_number = None
 
     return function_name, file_path, line_number
 
@@ -106,7 +155,141 @@ def _safe_repr(obj: Any, max_len: int = 200) -> str:
         return f"<{type(obj).__name__}>"
 
 
-def trace(func: F) -> F:
+def _traced_call(func: Callable, call_info: tuple, run_state: tuple, args: tuple,
+                 kwargs: dict) -> Any:
+    """Execute func inside the active trace run, queueing its call record.
+
+    Holds the bookkeeping for the active path of the @trace wrapper so the
+    wrapper itself stays small for the common inactive case. call_info is
+    the (function_name, file_path, line_number) tuple computed when func
+    was decorated; run_state is the thread's
+    (run_id, serialize, call_queue, accepts, next_call_id).
+    """
+    # Get context
+    run_id, serialize, call_queue, accepts, next_call_id = run_state
+
+    # Calls filtered out by the run's include/exclude patterns are not
+    # recorded; traced calls inside them attach to the nearest recorded caller
+    if accepts is not None and not accepts(call_info[0]):
+        return func(*args, **kwargs)
+    call_stack = _call_stack.get()
+
+    # Check depth to prevent runaway recursion
+    depth = len(call_stack)
+    if depth >= MAX_TRACE_DEPTH:
+        return func(*args, **kwargs)
+
+    parent_call_id = call_stack[-1] if call_stack else None
+
+    # Record call start. The call_id is allocated up front so nested calls
+    # can reference it; the finished row is queued for the writer thread
+    # once the call returns. Arguments are serialized here, on entry, so
+    # the record reflects them before the function can mutate them.
+    # Timestamps are queued as raw time_ns() values; the writer thread
+    # formats them.
+    called_at = time_ns()
+    start_ns = perf_counter_ns()
+    call_id = next_call_id()
+    args_json = serialize(args) if args else '[]'
+    # Most calls pass no keywords; skip the serializer for the empty dict
+    kwargs_json = serialize(kwargs) if kwargs else '{}'
+
+    # Push this call onto the stack
+    token = _call_stack.set(call_stack + (call_id,))
+
+    try:
+        # Execute the actual function
+        result = func(*args, **kwargs)
+
+        # Record success
+        duration_ns = perf_counter_ns() - start_ns
+        call_queue.put((
+            call_id, run_id, *call_info, called_at, time_ns(),
+            duration_ns / 1e6, args_json, kwargs_json,
+            serialize(result) if result is not None else None,
+            None, None, None, parent_call_id, depth
+        ))
+
+        return result
+
+    except BaseException as e:
+        # Record exception
+        duration_ns = perf_counter_ns() - start_ns
+        call_queue.put((
+            call_id, run_id, *call_info, called_at, time_ns(),
+            duration_ns / 1e6, args_json, kwargs_json,
+            None, type(e).__name__, str(e),
+            # Captured without source lines; formatted by the writer thread
+            traceback.TracebackException.from_exception(e, lookup_lines=False),
+            parent_call_id, depth
+        ))
+
+        # Re-raise the exception
+        raise
+
+    finally:
+        # Pop this call from the stack
+        _call_stack.reset(token)
+
+
+# Names the generated wrapper source uses itself; parameters with these names
+# keep the generic wrapper
+_SPECIALIZE_RESERVED = frozenset({'_loom_func', '_loom_traced', '_active_runs'})
+
+
+@lru_cache(maxsize=256)
+def _wrapper_factory(params: tuple) -> Callable:
+    """Compile a factory for fixed-arity wrappers taking exactly params.
+
+    Cached per parameter list, so e.g. every (self, x) method shares one
+    compiled factory.
+    """
+    arglist = ', '.join(params)
+    src = (
+        f"def make(_loom_func, _loom_traced):\n"
+        f"    def wrapper({arglist}):\n"
+        f"        if not _active_runs:\n"
+        f"            return _loom_func({arglist})\n"
+        f"        return _loom_traced({arglist})\n"
+        f"    return wrapper\n"
+    )
+    namespace = {}
+    # Module globals, so the generated code reads the live _active_runs
+    exec(compile(src, '<loom-trace-wrapper>', 'exec'), globals(), namespace)
+    return namespace['make']
+
+
+def _specialize_wrapper(func: Callable, generic: Callable) -> Optional[Callable]:
+    """Build a wrapper with func's exact parameter list, if func allows it.
+
+    Spelling out the parameters avoids packing an args tuple and kwargs dict
+    on every inactive call. Only plain functions whose parameters are all
+    required positionals qualify; anything with defaults, *args, **kwargs or
+    keyword-only parameters keeps the generic wrapper. Active calls go through
+    the generic wrapper, so arguments passed by keyword to a specialized
+    function are recorded positionally.
+
+    Returns:
+        The specialized wrapper, or None if func does not qualify
+    """
+    if not isinstance(func, types.FunctionType):
+        return None
+
+    code = func.__code__
+    if (code.co_flags & (inspect.CO_VARARGS | inspect.CO_VARKEYWORDS)
+            or code.co_kwonlyargcount
+            or func.__defaults__
+            or func.__kwdefaults__):
+        return None
+
+    params = code.co_varnames[:code.co_argcount]
+    if _SPECIALIZE_RESERVED.intersection(params):
+        return None
+
+    return _wrapper_factory(params)(func, generic)
+
+
+def trace(func: F = None, *, sample: int = 1) -> F:
     """Decorator to trace function execution.
 
     When tracing is active (inside a trace_run context), records:
@@ -117,107 +300,71 @@ def trace(func: F) -> F:
     - Call parent/depth for nested calls
 
     When tracing is NOT active, the function executes with zero overhead
-    (just a single attribute check per call).
+    (just a single module-global check per call). With LOOM_DISABLE_TRACE=1
+    the function is returned unwrapped.
+
+    Use @trace(sample=N) on very hot functions to record only every Nth
+    call made while tracing is active; the rest run untraced, and calls
+    nested inside them attach to the nearest recorded caller.
 
     Args:
         func: The function to trace
+        sample: Record one call in every `sample` (default 1: every call)
 
     Returns:
         Wrapped function that records trace data when tracing is active
+
+    Example:
+        @trace(sample=100)
+        def tokenize(line): ...
     """
+    if sample < 1:
+        raise ValueError(f"sample must be at least 1, got {sample}")
+    if func is None:
+        return lambda f: trace(f, sample=sample)
+
+    if _DISABLED:
+        return func
+
     # Mark this wrapper as a tracer function to avoid tracing ourselves
     _tracer_functions.add(id(trace))
 
     # Pre-compute function info at decoration time (not call time)
-    function_name, file_path, line_number = _get_function_info(func)
-
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        # Fast path: if no active trace run, just execute
-        # This is the "zero overhead when tracing is not active" requirement
-        if not getattr(_trace_context, 'run_id', None):
-            return func(*args, **kwargs)
-
-        # Get context
-        run_id = _trace_context.run_id
-        store = _trace_context.store
-        call_stack = getattr(_trace_context, 'call_stack', [])
-
-        # Check depth to prevent runaway recursion
-        depth = len(call_stack)
-        if depth >= MAX_TRACE_DEPTH:
-            return func(*args, **kwargs)
-
-        parent_call_id = call_stack[-1] if call_stack else None
-
-        # Record call start
-        called_at = datetime.utcnow().isoformat()
-        start_time = time.perf_counter()
-
-        # Record the call entry (we'll update with result/exception later)
-        call_id = store.record_call(
-            run_id=run_id,
-            function_name=function_name,
-            file_path=file_path,
-            line_number=line_number,
-            called_at=called_at,
-            args=args,
-            kwargs=kwargs,
-            parent_call_id=parent_call_id,
-            depth=depth
-        )
-
-        # Push this call onto the stack
-        call_stack.append(call_id)
-        _trace_context.call_stack = call_stack
+    call_info = _get_function_info(func)
+
+    if sample == 1:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            # Fast path: if no trace run is active anywhere, just execute
+            # This is the "zero overhead when tracing is not active" requirement
+            if not _active_runs:
+                return func(*args, **kwargs)
+
+            # Another thread may be tracing; only record if this one is too
+            run_state = getattr(_trace_context, 'run_state', None)
+            if run_state is None:
+                return func(*args, **kwargs)
+
+            return _traced_call(func, call_info, run_state, args, kwargs)
+    else:
+        # Per-function stride counter: the first active call is recorded,
+        # then every sample-th one after it
+        calls = count()
 
-        try:
-            # Execute the actual function
-            result = func(*args, **kwargs)
-
-            # Record success
-            end_time = time.perf_counter()
-            duration_ms = (end_time - start_time) * 1000
-            returned_at = datetime.utcnow().isoformat()
-
-            # Update the call record with return value and timing
-            store.conn.execute(
-                """UPDATE trace_calls
-                   SET returned_at = ?, duration_ms = ?, return_value_json = ?
-                   WHERE call_id = ?""",
-                (returned_at, duration_ms, store._safe_serialize(result), call_id)
-            )
-            store.conn.commit()
-
-            return result
-
-        except BaseException as e:
-            # Record exception
-            end_time = time.perf_counter()
-            duration_ms = (end_time - start_time) * 1000
-            returned_at = datetime.utcnow().isoformat()
-
-            # Get full traceback
-            tb = traceback.format_exc()
-
-            # Update the call record with exception info
-            store.conn.execute(
-                """UPDATE trace_calls
-                   SET returned_at = ?, duration_ms = ?,
-                       exception_type = ?, exception_message = ?, exception_traceback = ?
-                   WHERE call_id = ?""",
-                (returned_at, duration_ms, type(e).__name__, str(e), tb, call_id)
-            )
-            store.conn.commit()
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _active_runs:
+                return func(*args, **kwargs)
 
-            # Re-raise the exception
-            raise
+            run_state = getattr(_trace_context, 'run_state', None)
+            if run_state is None or next(calls) % sample:
+                return func(*args, **kwargs)
 
-        finally:
-            # Pop this call from the stack
-            if call_stack and call_stack[-1] == call_id:
-                call_stack.pop()
-                _trace_context.call_stack = call_stack
+            return _traced_call(func, call_info, run_state, args, kwargs)
+
+    specialized = _specialize_wrapper(func, wrapper)
+    if specialized is not None:
+        wrapper = wraps(func)(specialized)
 
     # Mark the wrapper so we can identify traced functions
     wrapper._is_traced = True
@@ -226,19 +373,132 @@ def trace(func: F) -> F:
     return wrapper  # type: ignore
 
 
+def _name_filter(include: Optional[Iterable[str]],
+                 exclude: Optional[Iterable[str]]) -> Optional[Callable[[str], bool]]:
+    """Build the per-run test for which function names get recorded.
+
+    Patterns are fnmatch-style globs matched against the fully qualified
+    function name. The verdict is memoized per name, so a traced function
+    pays the regex match once per run.
+
+    Returns:
+        A function name -> bool predicate, or None when nothing is filtered
+    """
+    if not include and not exclude:
+        return None
+
+    def compile_globs(patterns):
+        if not patterns:
+            return None
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        return re.compile('|'.join(translate(p) for p in patterns))
+
+    include_re = compile_globs(include)
+    exclude_re = compile_globs(exclude)
+
+    @cache
+    def accepts(function_name: str) -> bool:
+        if include_re is not None and not include_re.match(function_name):
+            return False
+        return exclude_re is None or not exclude_re.match(function_name)
+
+    return accepts
+
+
+def _iso_from_ns(ns: int) -> str:
+    """Format a time_ns() value as datetime.utcnow().isoformat() would."""
+    return (_EPOCH + timedelta(microseconds=ns // 1000)).isoformat()
+
+
+def _finish_row(row: tuple) -> tuple:
+    """Turn a queued row into trace_calls column values.
+
+    Formats the called_at/returned_at time_ns() values as ISO timestamps
+    and renders the captured TracebackException, if any, to text.
+    """
+    tb = row[13]
+    return (
+        row[:5]
+        + (_iso_from_ns(row[5]), _iso_from_ns(row[6]))
+        + row[7:13]
+        + (''.join(tb.format()) if tb is not None else None,)
+        + row[14:]
+    )
+
+
+def _write_trace_calls(db_path: str, call_queue: queue.SimpleQueue,
+                       errors: list) -> None:
+    """Writer thread body: drain queued call rows into the database.
+
+    Runs with its own CodeStore because SQLite connections cannot be shared
+    across threads. Exits after receiving _WRITER_STOP, writing anything still
+    buffered when the store is closed.
+
+    If the store cannot be opened or a write fails (e.g. "database is
+    locked" after busy_timeout), the exception is appended to errors for
+    trace_run() to report, and the thread keeps consuming the queue until
+    _WRITER_STOP, discarding rows, so traced calls never pile up in memory.
+    """
+    store = None
+    stopped = False
+    try:
+        store = _get_codestore()(db_path)
+        while not stopped:
+            row = call_queue.get()
+            if row is _WRITER_STOP:
+                stopped = True
+                break
+
+            batch = [row]
+            while len(batch) < WRITER_BATCH_SIZE:
+                try:
+                    row = call_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if row is _WRITER_STOP:
+                    stopped = True
+                    break
+                batch.append(row)
+
+            store.record_calls([_finish_row(row) for row in batch])
+        store.close()
+    except Exception as e:
+        errors.append(e)
+        while not stopped:
+            stopped = call_queue.get() is _WRITER_STOP
+        if store is not None:
+            try:
+                store.close()
+            except Exception:
+                pass
+
+
 @contextmanager
-def trace_run(command: Optional[str] = None, db_path: str = '.loom/store.db'):
+def trace_run(command: Optional[str] = None, db_path: str = '.loom/store.db',
+              include: Optional[Iterable[str]] = None,
+              exclude: Optional[Iterable[str]] = None):
     """Context manager for a trace run.
 
     Creates a trace run record in the database and sets up thread-local
-    context for the @trace decorator to record function calls.
+    context for the @trace decorator to record function calls. Recorded
+    calls are written by a background writer thread, so SQLite inserts stay
+    off the traced code's path; the thread is drained and joined on exit.
 
     Args:
         command: Optional description of what is being executed
         db_path: Path to the Loom database (default: .loom/store.db)
+        include: Only record functions whose qualified name matches one of
+            these fnmatch-style patterns, e.g. ["mypkg.parser.*"] (optional)
+        exclude: Never record functions matching one of these patterns,
+            e.g. ["*.__repr__", "mypkg.utils.*"] (optional)
 
     Yields:
-        run_id: The UUID of the trace run
+        run_id: The UUID of the trace run (None when LOOM_DISABLE_TRACE=1)
+
+    Raises:
+        RuntimeError: On exit, if the writer thread failed and calls were
+            lost (a RuntimeWarning instead when the with block raised)
 
     Example:
         with trace_run(command="process_data.py") as run_id:
@@ -249,6 +509,10 @@ def trace_run(command: Optional[str] = None, db_path: str = '.loom/store.db'):
         store = CodeStore(db_path)
         calls = store.get_calls_for_run(run_id)
     """
+    if _DISABLED:
+        yield None
+        return
+
     CodeStore = _get_codestore()
 
     # Create the store connection
@@ -257,16 +521,38 @@ def trace_run(command: Optional[str] = None, db_path: str = '.loom/store.db'):
     # Start the trace run
     run_id = store.start_trace_run(command=command)
 
+    # Start the writer thread that stores calls as they complete
+    call_queue = queue.SimpleQueue()
+    writer_errors = []
+    writer = threading.Thread(
+        target=_write_trace_calls,
+        args=(db_path, call_queue, writer_errors),
+        name=f"loom-trace-writer-{run_id[:8]}",
+        daemon=True,
+    )
+    writer.start()
+
     # Set up thread-local context
-    _trace_context.run_id = run_id
+    global _active_runs
+    with _active_runs_lock:
+        _active_runs += 1
+    # Call IDs are "<run_id>.<hex sequence>": unique across runs like the
+    # run's UUID, but several times cheaper to produce than a uuid4 per call
+    next_call_id = map(f"{run_id}.{{:x}}".format, count(1)).__next__
+    _trace_context.run_state = (
+        run_id, store._safe_serialize, call_queue, _name_filter(include, exclude),
+        next_call_id
+    )
     _trace_context.store = store
-    _trace_context.call_stack = []
+    stack_token = _call_stack.set(())
 
     status = 'completed'
     exit_code = 0
+    body_returned = False
 
     try:
         yield run_id
+        body_returned = True
     except SystemExit as e:
         status = 'completed' if e.code == 0 else 'failed'
         exit_code = e.code if isinstance(e.code, int) else 1
@@ -281,14 +567,32 @@ def trace_run(command: Optional[str] = None, db_path: str = '.loom/store.db'):
         raise
     finally:
         # Clean up thread-local context
-        _trace_context.run_id = None
+        with _active_runs_lock:
+            _active_runs -= 1
+        _trace_context.run_state = None
         _trace_context.store = None
-        _trace_context.call_stack = []
+        _call_stack.reset(stack_token)
 
-        # End the trace run
+        # Wait for the writer to store every queued call, then end the run
+        call_queue.put(_WRITER_STOP)
+        writer.join()
         store.end_trace_run(run_id, status=status, exit_code=exit_code)
         store.close()
 
+        if writer_errors and not body_returned:
+            # Don't mask the exception already leaving the with block
+            warnings.warn(
+                f"trace writer failed, calls from run {run_id} were not all "
+                f"recorded: {writer_errors[0]!r}",
+                RuntimeWarning, stacklevel=3
+            )
+
+    if writer_errors:
+        raise RuntimeError(
+            f"trace writer failed, calls from run {run_id} were not all "
+            f"recorded: {writer_errors[0]!r}"
+        ) from writer_errors[0]
+
 
 def trace_module(module) -> None:
     """Instrument all functions in a module.
@@ -306,13 +610,15 @@ def trace_module(module) -> None:
         trace_module(my_module)
         # Now all functions in my_module will be traced
     """
-    for name in dir(module):
+    if _DISABLED:
+        return
+
+    # Snapshot the namespace: setattr below replaces entries while we iterate
+    for name, obj in list(vars(module).items()):
         # Skip private/magic names
         if name.startswith('_'):
             continue
 
-        obj = getattr(module, name)
-
         # Skip if already traced
         if getattr(obj, '_is_traced', False):
             continue
@@ -352,37 +658,48 @@ def trace_class(cls: type) -> type:
         # Or after the fact:
         trace_class(ExistingClass)
     """
-    for name, method in inspect.getmembers(cls):
-        # Skip private/magic methods
-        if name.startswith('_'):
-            continue
+    if _DISABLED:
+        return cls
+
+    # Walk the MRO's namespaces directly instead of inspect.getmembers(),
+    # which resolves every attribute through getattr and sorts the result.
+    # The first definition found wins, so inherited methods are still wrapped
+    # (on cls) exactly once, matching attribute lookup order.
+    seen: Set[str] = set()
+    for klass in cls.__mro__[:-1]:  # Skip object
+        for name, attr in list(vars(klass).items()):
+            if name in seen:
+                continue
+            seen.add(name)
+
+            # Skip private/magic methods
+            if name.startswith('_'):
+                continue
+
+            # Handle different method types
+            if isinstance(attr, (staticmethod, classmethod)):
+                func = attr.__func__
+            elif callable(attr) and not isinstance(attr, type):
+                func = attr
+            else:
+                continue
+
+            # Skip if already traced
+            if getattr(func, '_is_traced', False):
+                continue
+
+            # Skip if it's a tracer function
+            if id(func) in _tracer_functions:
+                continue
 
-        # Skip if already traced
-        if getattr(method, '_is_traced', False):
-            continue
-
-        # Skip if it's a tracer function
-        if id(method) in _tracer_functions:
-            continue
-
-        # Handle different method types
-        if isinstance(inspect.getattr_static(cls, name), staticmethod):
-            # Static method
-            try:
-                setattr(cls, name, staticmethod(trace(method)))
-            except (TypeError, AttributeError):
-                pass
-        elif isinstance(inspect.getattr_static(cls, name), classmethod):
-            # Class method - get the underlying function
-            try:
-                underlying = method.__func__
-                setattr(cls, name, classmethod(trace(underlying)))
-            except (TypeError, AttributeError):
-                pass
-        elif callable(method) and not isinstance(method, type):
-            # Regular instance method
             try:
-                setattr(cls, name, trace(method))
+                if isinstance(attr, staticmethod):
+                    setattr(cls, name, staticmethod(trace(func)))
+                elif isinstance(attr, classmethod):
+                    setattr(cls, name, classmethod(trace(func)))
+                else:
+                    # Regular instance method
+                    setattr(cls, name, trace(func))
             except (TypeError, AttributeError):
                 pass
 
@@ -13,13 +13,22 @@ Reports:
 """
 
 import json
+import os
 import re
 import subprocess
 import shutil
+import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, field
 
+# Optional orjson for faster decoding of cross_file_refs metadata
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Optional esprima for JS syntax validation
 try:
     import esprima
@@ -31,6 +40,17 @@ except ImportError:
 # Check for esbuild availability
 HAS_ESBUILD = shutil.which('npx') is not None
 
+# Imports that start with ./ or ../ (the ones resolved against the filesystem)
+_RELATIVE_IMPORT_SQL = "(cfr.target_name LIKE './%' OR cfr.target_name LIKE '../%')"
+
+# Distinct HTML element IDs. dom_element entities are named
+# "filename#elementId"; the ID is everything after the first '#'.
+_HTML_IDS_SQL = """
+    SELECT DISTINCT substr(name, instr(name, '#') + 1) AS element_id
+    FROM entities
+    WHERE kind = 'dom_element' AND instr(name, '#') > 0
+"""
+
 
 @dataclass
 class ValidationIssue:
@@ -127,58 +147,68 @@ class CodeValidator:
         """
         result = ValidationResult()
 
-        # Get all unresolved imports from cross_file_refs
-        cursor = self.store.conn.execute("""
+        # Count relative and external imports in one aggregate; external
+        # (node_modules) imports are not validated beyond this
+        total_refs, relative_imports = self.store.conn.execute(f"""
+            SELECT
+                COUNT(*),
+                COALESCE(SUM(CASE WHEN {_RELATIVE_IMPORT_SQL} THEN 1 ELSE 0 END), 0)
+            FROM cross_file_refs cfr
+            JOIN entities e ON cfr.source_entity_id = e.id
+            WHERE cfr.ref_type = 'imports'
+        """).fetchone()
+        external_imports = total_refs - relative_imports
+
+        # Get the relative imports, which can be checked against the filesystem
+        cursor = self.store.conn.execute(f"""
             SELECT
                 cfr.target_name,
                 cfr.source_file,
                 cfr.line_number,
-                cfr.verifiable,
-                cfr.verification_reason,
-                cfr.metadata,
                 e.name as source_entity_name
             FROM cross_file_refs cfr
             JOIN entities e ON cfr.source_entity_id = e.id
-            WHERE cfr.ref_type = 'imports'
+            WHERE cfr.ref_type = 'imports' AND {_RELATIVE_IMPORT_SQL}
+            ORDER BY cfr.id
         """)
 
-        total_refs = 0
-        relative_imports = 0
         missing_imports = 0
-        external_imports = 0
 
-        for row in cursor.fetchall():
-            total_refs += 1
+        # The same import from the same directory (shared utilities, barrel
+        # files) resolves the same way; probe the filesystem once per pair.
+        # Scoped to this call so a later run sees files added since.
+        resolved_imports: Dict[Tuple[str, str], Optional[Path]] = {}
+        listings: Dict[str, frozenset] = {}  # Directory -> names, for _resolve_import
+
+        for row in cursor:
             import_path = row['target_name']
             source_file = row['source_file'] or 'unknown'
             line = row['line_number'] or 0
             source_entity = row['source_entity_name']
 
-            # Check if it's a relative import (can be validated)
-            if import_path.startswith('./') or import_path.startswith('../'):
-                relative_imports += 1
-
-                # Resolve the import path relative to source file
-                if source_file != 'unknown':
+            # Resolve the import path relative to source file
+            if source_file != 'unknown':
+                key = (os.path.dirname(source_file), import_path)
+                if key in resolved_imports:
+                    resolved = resolved_imports[key]
+                else:
                     source_dir = Path(source_file).parent
-                    resolved = self._resolve_import(source_dir, import_path)
-
-                    if resolved is None:
-                        missing_imports += 1
-                        result.errors.append(ValidationIssue(
-                            level='error',
-                            category='import',
-                            message=f"Import '{import_path}' not found",
-                            file=source_file,
-                            line=line,
-                            details={
-                                'import_path': import_path,
-                                'source_module': source_entity,
-                            }
-                        ))
-            else:
-                # External/node_modules import - not validated
-                external_imports += 1
+                    resolved = self._resolve_import(source_dir, import_path, listings)
+                    resolved_imports[key] = resolved
+
+                if resolved is None:
+                    missing_imports += 1
+                    result.errors.append(ValidationIssue(
+                        level='error',
+                        category='import',
+                        message=f"Import '{import_path}' not found",
+                        file=source_file,
+                        line=line,
+                        details={
+                            'import_path': import_path,
+                            'source_module': source_entity,
+                        }
+                    ))
 
         result.stats = {
             'total_unresolved': total_refs,
@@ -199,26 +229,29 @@ class CodeValidator:
         """
         result = ValidationResult()
 
-        # Get all HTML element IDs (dom_element entities)
-        html_ids = set()
-        html_id_files = {}  # Map ID -> file where it's defined
+        # Count the HTML element IDs; a sample of them is fetched for the
+        # error hints only if some reference turns out to be missing
+        html_id_count = self.store.conn.execute(
+            f"SELECT COUNT(*) FROM ({_HTML_IDS_SQL})"
+        ).fetchone()[0]
+        available_ids = None
 
-        cursor = self.store.conn.execute("""
-            SELECT name, metadata FROM entities
-            WHERE kind = 'dom_element'
-        """)
+        # Count every DOM reference, and the unverifiable ones, in one
+        # aggregate; only the problem references are fetched below
+        total_refs, unverifiable_refs = self.store.conn.execute("""
+            SELECT
+                COUNT(*),
+                COALESCE(SUM(CASE WHEN coalesce(cfr.verifiable, 0) THEN 0 ELSE 1 END), 0)
+            FROM cross_file_refs cfr
+            JOIN entities e ON cfr.source_entity_id = e.id
+            WHERE cfr.ref_type = 'dom_reference'
+        """).fetchone()
+        verifiable_refs = total_refs - unverifiable_refs
 
-        for row in cursor.fetchall():
-            # Name format is "filename#elementId"
-            name = row['name']
-            if '#' in name:
-                element_id = name.split('#', 1)[1]
-                html_ids.add(element_id)
-                metadata = json.loads(row['metadata']) if row['metadata'] else {}
-                html_id_files[element_id] = metadata.get('file_path', 'unknown')
-
-        # Get all DOM references from cross_file_refs table
-        cursor = self.store.conn.execute("""
+        # Get only the DOM references that produce an issue: unverifiable ones,
+        # and verifiable ones whose element does not exist. The IN test
+        # against the element IDs is built once into a temporary index.
+        cursor = self.store.conn.execute(f"""
             SELECT
                 cfr.target_name,
                 cfr.source_file,
@@ -230,21 +263,20 @@ class CodeValidator:
             FROM cross_file_refs cfr
             JOIN entities e ON cfr.source_entity_id = e.id
             WHERE cfr.ref_type = 'dom_reference'
+              AND (NOT coalesce(cfr.verifiable, 0)
+                   OR cfr.target_name NOT IN ({_HTML_IDS_SQL}))
+            ORDER BY cfr.id
         """)
 
-        total_refs = 0
-        verifiable_refs = 0
-        unverifiable_refs = 0
         missing_refs = 0
 
-        for row in cursor.fetchall():
-            total_refs += 1
+        for row in cursor:
+            verifiable = row['verifiable']
             target_name = row['target_name']
             source_file = row['source_file'] or 'unknown'
             line = row['line_number'] or 0
-            verifiable = row['verifiable']
             reason = row['verification_reason']
-            metadata = json.loads(row['metadata']) if row['metadata'] else {}
+            metadata = _json_loads(row['metadata']) if row['metadata'] else {}
             source_entity = row['source_entity_name']
 
             method = metadata.get('method', 'getElementById')
@@ -252,7 +284,6 @@ class CodeValidator:
 
             if not verifiable:
                 # Cannot verify - add warning
-                unverifiable_refs += 1
                 result.warnings.append(ValidationIssue(
                     level='warning',
                     category='dom_reference',
@@ -267,31 +298,35 @@ class CodeValidator:
                     }
                 ))
             else:
-                verifiable_refs += 1
-                # Check if element exists
-                if target_name not in html_ids:
-                    missing_refs += 1
-                    result.errors.append(ValidationIssue(
-                        level='error',
-                        category='dom_reference',
-                        message=f"DOM element '{target_name}' not found - {method}('{selector}') references non-existent element",
-                        file=source_file,
-                        line=line,
-                        details={
-                            'method': method,
-                            'selector': selector,
-                            'element_id': target_name,
-                            'caller': source_entity,
-                            'available_ids': list(html_ids)[:10]  # Show some available IDs
-                        }
-                    ))
+                # Element does not exist
+                missing_refs += 1
+                if available_ids is None:
+                    available_ids = [
+                        r[0] for r in self.store.conn.execute(
+                            f"{_HTML_IDS_SQL} ORDER BY element_id LIMIT 10"
+                        )
+                    ]
+                result.errors.append(ValidationIssue(
+                    level='error',
+                    category='dom_reference',
+                    message=f"DOM element '{target_name}' not found - {method}('{selector}') references non-existent element",
+                    file=source_file,
+                    line=line,
+                    details={
+                        'method': method,
+                        'selector': selector,
+                        'element_id': target_name,
+                        'caller': source_entity,
+                        'available_ids': list(available_ids)  # Show some available IDs
+                    }
+                ))
 
         result.stats = {
             'total_references': total_refs,
             'verifiable': verifiable_refs,
             'unverifiable': unverifiable_refs,
             'missing': missing_refs,
-            'html_elements': len(html_ids)
+            'html_elements': html_id_count
         }
 
         return result
@@ -324,7 +359,7 @@ class CodeValidator:
 
         for row in cursor.fetchall():
             class_name = row['name']
-            metadata = json.loads(row['metadata']) if row['metadata'] else {}
+            metadata = _json_loads(row['metadata']) if row['metadata'] else {}
             methods = metadata.get('methods', [])
 
             for method in methods:
@@ -362,7 +397,7 @@ class CodeValidator:
 
             # Check if this looks like a property accessor (getter/setter in JS)
             # JS getters are defined as `get propName()` in class body
-            metadata = json.loads(row['metadata']) if row['metadata'] else {}
+            metadata = _json_loads(row['metadata']) if row['metadata'] else {}
             code = metadata.get('code', '')
 
             # Detect JS getter syntax: get foo() { ... }
@@ -420,7 +455,7 @@ class CodeValidator:
             method_name = row['target_name']
             source_file = row['source_file'] or 'unknown'
             line = row['line_number'] or 0
-            metadata = json.loads(row['metadata']) if row['metadata'] else {}
+            metadata = _json_loads(row['metadata']) if row['metadata'] else {}
             caller = row['caller_name']
             full_expr = metadata.get('full_expression', method_name)
             obj_path = metadata.get('object_path', [])
@@ -1239,11 +1274,22 @@ class CodeValidator:
         # (e.g., "Unexpected token ." after "?")
         return None
 
-    def _resolve_import(self, source_dir: Path, import_path: str) -> Optional[Path]:
+    def _resolve_import(
+        self,
+        source_dir: Path,
+        import_path: str,
+        listings: Optional[Dict[str, frozenset]] = None
+    ) -> Optional[Path]:
         """Resolve a relative import path to an actual file.
 
         Tries common extensions: .js, .ts, .jsx, .tsx, /index.js, etc.
+        Candidates are looked up in directory listings, one os.scandir() per
+        directory, rather than stat'ed one at a time. Pass the same listings
+        dict for every import of a run to share them.
         """
+        if listings is None:
+            listings = {}
+
         # Normalize the path
         target = source_dir / import_path
 
@@ -1254,26 +1300,59 @@ class CodeValidator:
         # Try direct path with extensions
         for ext in extensions:
             check_path = target.with_suffix(ext)
-            if check_path.exists():
+            if _listed(check_path, listings):
                 return check_path
 
         # Try as directory with index file
         if target.is_dir():
             for index_file in index_files:
                 check_path = target / index_file
-                if check_path.exists():
+                if _listed(check_path, listings):
                     return check_path
 
         # Try adding extensions to already-suffixed path
         target_str = str(target)
         for ext in extensions:
             check_path = Path(target_str + ext)
-            if check_path.exists():
+            if _listed(check_path, listings):
                 return check_path
 
         return None
 
 
+# Names compare case-insensitively where the usual filesystem does
+_CASE_INSENSITIVE_FS = sys.platform in ('darwin', 'win32')
+
+
+def _list_dir(directory: str) -> frozenset:
+    """Names of the existing files and directories in directory.
+
+    Dangling symlinks are left out, matching Path.exists(). A missing or
+    unreadable directory lists as empty.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            names = [entry.name for entry in entries
+                     if entry.is_file() or entry.is_dir()]
+    except OSError:
+        return frozenset()
+    if _CASE_INSENSITIVE_FS:
+        names = map(str.casefold, names)
+    return frozenset(names)
+
+
+def _listed(path: Path, listings: Dict[str, frozenset]) -> bool:
+    """Path.exists() answered from a cached listing of the parent directory."""
+    parent = str(path.parent)
+    names = listings.get(parent)
+    if names is None:
+        names = listings[parent] = _list_dir(parent)
+    name = path.name
+    if _CASE_INSENSITIVE_FS:
+        name = name.casefold()
+    return name in names
+
+
 def cmd_validate(args):
     """Run code validation and report issues."""
     from codestore import CodeStore